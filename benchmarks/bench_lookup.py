@@ -0,0 +1,33 @@
+"""Per-request cost of resolving a guess: linear dataset scan vs. the canonical index.
+
+Run from the repo root:  python benchmarks/bench_lookup.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pokemon  # noqa: E402
+
+GUESSES = ['pikachu', 'Alolan Vulpix', 'mr. mime', 'zoroark-hisui', 'pawmot', 'notapokemon']
+
+
+def scan_lookup(name):
+    # The pre-index implementation used by every route
+    norm = pokemon.canonical_name(name)
+    matches = [p for p in pokemon.current_snapshot().pokemon_list if pokemon.canonical_name(p.name) == norm]
+    return max(matches, key=lambda p: p.generation or 0) if matches else None
+
+
+def main(number=2000):
+    for name in GUESSES:
+        assert scan_lookup(name) is pokemon.find_pokemon(name), name
+    print(f'{len(pokemon.current_snapshot().pokemon_list)} entries, {len(GUESSES)} guesses x {number} rounds')
+    for label, fn in (('scan', scan_lookup), ('index', pokemon.find_pokemon)):
+        total = timeit.timeit(lambda: [fn(n) for n in GUESSES], number=number)
+        print(f'{label:>6}: {total / (number * len(GUESSES)) * 1e6:8.2f} us/lookup')
+
+
+if __name__ == '__main__':
+    main()
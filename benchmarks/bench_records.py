@@ -0,0 +1,54 @@
+"""Pokémon rows as plain dicts versus pokemon_dataset's slotted records.
+
+Compares memory per entry (tracemalloc, strings included) and the field reads
+check_guess does per guess, on the rows of the compiled dataset.
+
+    python benchmarks/bench_records.py
+"""
+import gc
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pokemon_dataset  # noqa: E402
+
+def allocated(build):
+    gc.collect()
+    tracemalloc.start()
+    rows = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return rows, size
+
+def dict_fields(guess, target):
+    # evaluate_guess before records
+    return (guess.get('generation') == target.get('generation'), guess.get('type1') == target.get('type1'),
+            guess.get('type2') == target.get('type2'), guess.get('weight'), guess.get('height'), target.get('name'))
+
+def record_fields(guess, target):
+    return (guess.generation == target.generation, guess.type1 == target.type1,
+            guess.type2 == target.type2, guess.weight, guess.height, target.name)
+
+def main():
+    data = pokemon_dataset.get_dataset()
+    print(f"{len(data['pokemon'])} Pokémon rows, {len(data['cache'])} cache rows")
+    for label, fields, rows, record_type in (
+            ('pokemon', data['pokemon_fields'], data['pokemon'], pokemon_dataset.PokemonRecord),
+            ('cache', data['cache_fields'], data['cache'], pokemon_dataset.CacheRecord)):
+        dicts, dict_size = allocated(lambda: pokemon_dataset.rows_to_dicts(fields, rows))
+        records, record_size = allocated(lambda: pokemon_dataset.load_records(record_type, fields, rows))
+        print(f'  {label:<8} dicts {dict_size / len(rows):5.0f} B/entry   records {record_size / len(rows):5.0f} B/entry')
+
+    dicts = pokemon_dataset.rows_to_dicts(data['pokemon_fields'], data['pokemon'])
+    records = pokemon_dataset.load_records(pokemon_dataset.PokemonRecord, data['pokemon_fields'], data['pokemon'])
+    number = 200
+    for label, fn, rows in (('dict .get', dict_fields, dicts), ('attributes', record_fields, records)):
+        target = rows[25]
+        total = min(timeit.repeat(lambda: [fn(p, target) for p in rows], number=number, repeat=5))
+        print(f'  {label:<11} {total / (number * len(rows)) * 1e9:6.0f} ns per guess (check_guess field reads)')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
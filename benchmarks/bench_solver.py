@@ -0,0 +1,58 @@
+"""Opener scoring: pure-Python feedback loops versus solver.py's NumPy matrix.
+
+Pure Python is timed on a sample of openers and extrapolated to all of them;
+the sampled scores are checked against the vectorized ones first.
+
+    python benchmarks/bench_solver.py [--sample 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np  # noqa: E402
+import solver  # noqa: E402
+
+def compare(a, b):
+    if not a or not b:
+        return 3
+    return (b > a) - (b < a) + 1
+
+def feedback(guess, target):
+    # Same rules as hints.feedback_codes, one pair at a time
+    return ((target.generation or 0) > (guess.generation or 0)) - ((target.generation or 0) < (guess.generation or 0)), \
+        (guess.type1 or '') == (target.type1 or ''), (guess.type2 or '') == (target.type2 or ''), \
+        compare(guess.weight, target.weight), compare(guess.height, target.height)
+
+def python_score(guess, candidates):
+    counts = Counter(feedback(guess, target) for target in candidates)
+    return sum(c * c for c in counts.values())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sample', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    candidates = solver.load_candidates()
+    n = len(candidates)
+    t0 = time.perf_counter()
+    solver.init_worker()
+    scores = solver.score_openers(np.arange(n))
+    numpy_s = time.perf_counter() - t0
+
+    sample = random.Random(1).sample(range(n), args.sample)
+    t0 = time.perf_counter()
+    python_scores = {i: python_score(candidates[i], candidates) for i in sample}
+    python_s = (time.perf_counter() - t0) / args.sample * n
+    assert all(python_scores[i] == scores[i][1] for i in sample), 'scores disagree'
+
+    print(f'{n} openers x {n} targets')
+    print(f'  pure Python (extrapolated from {args.sample}): {python_s:.1f}s')
+    print(f'  NumPy, one process, matrix included:    {numpy_s:.2f}s ({python_s / numpy_s:.0f}x)')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Cold-start cost of the app: import time and first-request latency.
+
+Each sample runs in a fresh interpreter with outbound connections blocked, so
+it also checks that startup never touches the network. Prints a summary and,
+with --output, writes the numbers as JSON for CI to track.
+
+    python benchmarks/bench_startup.py [--runs 5] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, socket, sys, time
+network_calls = []
+def blocked(*args, **kwargs):
+    network_calls.append(repr(args[:2]))
+    raise OSError('network disabled during startup benchmark')
+socket.socket.connect = blocked
+socket.create_connection = blocked
+
+t0 = time.perf_counter()
+import pokemon
+t1 = time.perf_counter()
+client = pokemon.app.test_client()
+client.get('/')
+t2 = time.perf_counter()
+client.post('/check_guess', json={'guess': 'pikachu', 'timezone_offset': 0})
+t3 = time.perf_counter()
+json.dump({
+    'import_ms': (t1 - t0) * 1000,
+    'first_page_ms': (t2 - t1) * 1000,
+    'first_guess_ms': (t3 - t2) * 1000,
+    'network_calls': len(network_calls),
+}, sys.stdout)
+'''
+
+
+def sample():
+    out = subprocess.run([sys.executable, '-c', CHILD], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    # The app may print debug lines before the JSON
+    return json.loads(out[out.rindex('{'):])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure app import time and first-request latency.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    samples = [sample() for _ in range(args.runs)]
+    results = {key: statistics.median(s[key] for s in samples) for key in ('import_ms', 'first_page_ms', 'first_guess_ms')}
+    results['network_calls'] = max(s['network_calls'] for s in samples)
+    results['runs'] = args.runs
+    for key, value in results.items():
+        print(f'{key:>15}: {value:.1f}' if isinstance(value, float) else f'{key:>15}: {value}')
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 1 if results['network_calls'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
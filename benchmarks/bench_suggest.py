@@ -0,0 +1,118 @@
+"""Autocomplete cost: the old in-browser matching versus the /suggest index.
+
+The baseline is a straight Python port of what templates/home.html ran on every
+keystroke (two filter passes over all names, then a full Levenshtein matrix
+against each name when nothing matched). Both sides answer the same queries,
+which are typed prefixes, one-edit typos and misses, and their answers are
+checked to be identical before timing.
+
+    python benchmarks/bench_suggest.py [--queries 2000] [--output suggest.json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pokemon  # noqa: E402
+import suggest  # noqa: E402
+
+def js_levenshtein(a, b):
+    matrix = [[i] for i in range(len(b) + 1)]
+    matrix[0] = list(range(len(a) + 1))
+    for i in range(1, len(b) + 1):
+        for j in range(1, len(a) + 1):
+            if b[i - 1] == a[j - 1]:
+                matrix[i].append(matrix[i - 1][j - 1])
+            else:
+                matrix[i].append(min(matrix[i - 1][j - 1] + 1, matrix[i][j - 1] + 1, matrix[i - 1][j] + 1))
+    return matrix[len(b)][len(a)]
+
+def js_suggest(names, val, limit=suggest.DEFAULT_LIMIT):
+    val = val.strip().lower()
+    if not val:
+        return [], None
+    starts = [n for n in names if n['display'].lower().startswith(val)]
+    contains = [n for n in names if not n['display'].lower().startswith(val) and val in n['display'].lower()]
+    matches = (starts + contains)[:limit]
+    if matches:
+        return matches, None
+    min_dist, closest = float('inf'), None
+    for n in names:
+        dist = js_levenshtein(val, n['display'].lower())
+        if dist < min_dist:
+            min_dist, closest = dist, n
+    return [], closest if 0 < min_dist <= 2 else None
+
+def make_queries(names, count, rng):
+    queries = []
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    while len(queries) < count:
+        display = rng.choice(names)['display'].lower()
+        kind = rng.random()
+        if kind < 0.6:
+            queries.append(display[:rng.randint(1, len(display))])
+        elif kind < 0.9:
+            i = rng.randrange(len(display))
+            queries.append(display[:i] + rng.choice(letters) + display[i + 1:] + rng.choice(['', letters[i % 26]]))
+        else:
+            queries.append(''.join(rng.choice(letters) for _ in range(rng.randint(4, 10))))
+    return queries
+
+def time_per_query(fn, queries):
+    samples = []
+    for query in queries:
+        t0 = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return samples
+
+def summary(samples):
+    samples = sorted(samples)
+    return {
+        'median_us': statistics.median(samples),
+        'p99_us': samples[int(len(samples) * 0.99) - 1],
+        'max_us': samples[-1],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare client-side name matching with the /suggest index.')
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    names = pokemon.current_snapshot().names
+    queries = make_queries(names, args.queries, random.Random(args.seed))
+
+    t0 = time.perf_counter()
+    index = suggest.SuggestIndex(names)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    mismatches = [q for q in queries if index._suggest(q) != js_suggest(names, q)]
+    if mismatches:
+        print(f'{len(mismatches)} queries disagree, e.g. {mismatches[:5]}')
+        return 1
+
+    results = {
+        'names': len(names),
+        'queries': len(queries),
+        'index_build_ms': build_ms,
+        'client_side': summary(time_per_query(lambda q: js_suggest(names, q), queries)),
+        # Uncached path: every query is computed from the index
+        'index': summary(time_per_query(index._suggest, queries)),
+    }
+    print(f"{results['names']} names, {results['queries']} queries, index built in {build_ms:.0f} ms")
+    for key in ('client_side', 'index'):
+        stats = results[key]
+        print(f"{key:>12}: median {stats['median_us']:.1f} us, p99 {stats['p99_us']:.1f} us, max {stats['max_us']:.1f} us")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
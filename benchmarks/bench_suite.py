@@ -0,0 +1,277 @@
+"""Micro-benchmarks plus an HTTP load test, written to JSON for regression tracking.
+
+Everything runs offline: a local PokéAPI stub (pokeapi_stub.py) stands in for
+pokeapi.co, with its on-disk cache pointed at a temporary directory and a TTL
+of 0, so each PokéAPI fallback fetch in the load test is a real (stub) round
+trip.
+
+    python benchmarks/bench_suite.py [--duration 10] [--clients 8] [--output bench_results.json]
+    python benchmarks/bench_suite.py --compare old.json   # exit 1 on regressions
+    python benchmarks/bench_suite.py --url http://127.0.0.1:8000 --skip-micro   # e.g. gunicorn
+
+Micro-benchmarks: canonical_name, find_pokemon_cache_entry,
+get_pokemon_of_the_day and building the /pokemon_names list.
+
+The load test serves the app on a threaded werkzeug server (or drives --url)
+from several client threads. The request mix is weighted like real play:
+mostly /check_guess with popular Pokémon guessed far more often than obscure
+ones (Zipf), some spelling variants and unknown names, a few guesses whose
+measurements have to come from PokéAPI, plus /suggest typing, /pokemon_names
+page loads (half revalidating with If-None-Match) and board restores through
+/check_guesses.
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pokeapi_stub  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(ROOT, 'bench_results.json')
+# Relative slowdown --compare reports as a regression
+DEFAULT_THRESHOLD = 0.2
+# Share of each request kind in the load test
+REQUEST_MIX = (
+    ('check_guess', 0.70),
+    ('suggest', 0.15),
+    ('pokemon_names', 0.10),
+    ('check_guesses', 0.05),
+)
+# Within /check_guess: variant spellings, unknown names and PokéAPI fallbacks
+VARIANT_RATE = 0.10
+UNKNOWN_RATE = 0.05
+FALLBACK_RATE = 0.03
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def time_per_call(fn, args_list, repeat=5):
+    """Microseconds per call of fn over args_list: best and median of `repeat` passes."""
+    timer = timeit.Timer(lambda: [fn(*args) for args in args_list])
+    number = timer.autorange()[0]  # Passes of at least 0.2s each
+    timings = timer.repeat(number=number, repeat=repeat)
+    per_call = [t / (number * len(args_list)) * 1e6 for t in timings]
+    return {'us_per_call': min(per_call), 'us_median': statistics.median(per_call), 'calls': number * len(args_list)}
+
+def run_micro(pokemon):
+    import pokemon_cache_loader
+    rng = random.Random(1)
+    names = [p.name for p in pokemon.current_snapshot().pokemon_list]
+    spellings = [rng.choice([n, n.upper(), n.replace(' ', '-'), n.title()]) for n in names]
+    offsets = [(rng.uniform(-12, 14),) for _ in range(200)]
+    results = {
+        'canonical_name': time_per_call(pokemon.canonical_name, [(n,) for n in spellings]),
+        'find_pokemon_cache_entry': time_per_call(pokemon_cache_loader.find_pokemon_cache_entry, [(n,) for n in spellings]),
+        'get_pokemon_of_the_day': time_per_call(pokemon.get_pokemon_of_the_day, offsets),
+        'build_pokemon_names': time_per_call(pokemon.build_pokemon_names, [(pokemon.current_snapshot().pokemon_list,)], repeat=3),
+    }
+    for name, r in results.items():
+        print(f'  {name:<26} {r["us_per_call"]:10.2f} us/call')
+    return results
+
+class Workload:
+    """Draws requests with the REQUEST_MIX proportions and a Zipf guess popularity."""
+
+    def __init__(self, pokemon, seed):
+        self.rng = random.Random(seed)
+        names = [entry['display'] for entry in pokemon.current_snapshot().names]
+        random.Random(0).shuffle(names)  # Popularity order, the same for every client
+        self.names = names
+        self.weights = [1.0 / (rank + 1) for rank in range(len(names))]
+        self.fallback_names = [p.display for p in pokemon.current_snapshot().pokemon_list if not pokemon.has_measurements(p)]
+        self.kinds = [kind for kind, _ in REQUEST_MIX]
+        self.kind_weights = [share for _, share in REQUEST_MIX]
+        today = datetime.date.today()
+        self.days = [(today - datetime.timedelta(days=d)).isoformat() for d in range(1, 30)]
+
+    def guess(self):
+        r = self.rng.random()
+        if r < UNKNOWN_RATE:
+            return 'notapokemon%d' % self.rng.randrange(1000)
+        if r < UNKNOWN_RATE + FALLBACK_RATE and self.fallback_names:
+            return self.rng.choice(self.fallback_names)
+        name = self.rng.choices(self.names, self.weights)[0]
+        if r < UNKNOWN_RATE + FALLBACK_RATE + VARIANT_RATE:
+            name = self.rng.choice([name.upper(), name.lower().replace(' ', '-'), f'  {name} '])
+        return name
+
+    def game(self):
+        # Most players are on today's puzzle; some browse the archive
+        return {'timezone_offset': self.rng.choice([0, -5, 1, 5.5, 9])} if self.rng.random() < 0.9 \
+            else {'date': self.rng.choice(self.days)}
+
+    def next(self, names_etag):
+        kind = self.rng.choices(self.kinds, self.kind_weights)[0]
+        if kind == 'check_guess':
+            return kind, 'POST', '/check_guess', dict(self.game(), guess=self.guess()), {}
+        if kind == 'check_guesses':
+            return kind, 'POST', '/check_guesses', dict(self.game(), guesses=[self.guess() for _ in range(6)]), {}
+        if kind == 'suggest':
+            name = self.rng.choices(self.names, self.weights)[0]
+            return kind, 'GET', '/suggest', {'q': name[:self.rng.randint(1, 4)]}, {}
+        headers = {'Accept-Encoding': 'gzip, br'}
+        if names_etag and self.rng.random() < 0.5:
+            headers['If-None-Match'] = names_etag
+        return kind, 'GET', '/pokemon_names', None, headers
+
+def client_loop(base_url, workload, deadline, samples, errors, names_etag):
+    import requests
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        kind, method, path, payload, headers = workload.next(names_etag)
+        started = time.perf_counter()
+        try:
+            if method == 'POST':
+                resp = session.post(base_url + path, json=payload, headers=headers, timeout=30)
+            else:
+                resp = session.get(base_url + path, params=payload, headers=headers, timeout=30)
+            resp.content
+            ok = resp.status_code < 500
+        except requests.RequestException:
+            ok = False
+        samples.setdefault(kind, []).append(time.perf_counter() - started)
+        if not ok:
+            errors[kind] = errors.get(kind, 0) + 1
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def run_load(pokemon, base_url, duration, clients, seed):
+    import requests
+    names_etag = requests.get(base_url + '/pokemon_names', headers={'Accept-Encoding': 'gzip, br'}).headers.get('ETag')
+    per_client = [({}, {}) for _ in range(clients)]
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=client_loop, args=(base_url, Workload(pokemon, seed + i), deadline,
+                                                         samples, errors, names_etag))
+               for i, (samples, errors) in enumerate(per_client)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    results = {'clients': clients, 'duration_s': elapsed, 'endpoints': {}}
+    total = 0
+    for kind, _ in REQUEST_MIX:
+        latencies = [s for samples, _ in per_client for s in samples.get(kind, [])]
+        errors = sum(e.get(kind, 0) for _, e in per_client)
+        if not latencies:
+            continue
+        total += len(latencies)
+        results['endpoints'][kind] = {
+            'requests': len(latencies),
+            'errors': errors,
+            'rps': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+        }
+        r = results['endpoints'][kind]
+        print(f'  {kind:<14} {r["requests"]:7d} req {r["rps"]:8.1f}/s  p50 {r["p50_ms"]:7.2f} ms  '
+              f'p95 {r["p95_ms"]:7.2f} ms  p99 {r["p99_ms"]:7.2f} ms  errors {errors}')
+    results['total_rps'] = total / elapsed
+    print(f'  {"total":<14} {total:7d} req {results["total_rps"]:8.1f}/s')
+    return results
+
+def compare(results, baseline, threshold):
+    """Lines describing metrics that got more than `threshold` worse than the baseline."""
+    regressions = []
+    for name, r in results.get('micro', {}).items():
+        old = baseline.get('micro', {}).get(name)
+        if old and r['us_per_call'] > old['us_per_call'] * (1 + threshold):
+            regressions.append(f'{name}: {old["us_per_call"]:.2f} -> {r["us_per_call"]:.2f} us/call')
+    for kind, r in results.get('load', {}).get('endpoints', {}).items():
+        old = baseline.get('load', {}).get('endpoints', {}).get(kind)
+        if old and r['p95_ms'] > old['p95_ms'] * (1 + threshold):
+            regressions.append(f'{kind}: p95 {old["p95_ms"]:.2f} -> {r["p95_ms"]:.2f} ms')
+        if old and r['errors'] > old['errors']:
+            regressions.append(f'{kind}: {old["errors"]} -> {r["errors"]} errors')
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=10, help='load test length in seconds')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent load test clients')
+    parser.add_argument('--url', help='load test a running server instead of an in-process one')
+    parser.add_argument('--stub-latency-ms', type=float, default=20, help='delay of every PokéAPI stub response')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-load', action='store_true')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--compare', metavar='BASELINE', help='previous results to check for regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    # Set up the stub and an isolated environment before the app is imported
+    stub, stub_url = pokeapi_stub.start(latency_ms=args.stub_latency_ms)
+    scratch = tempfile.TemporaryDirectory()
+    os.environ['POKEAPI_BASE_URL'] = stub_url
+    os.environ['POKEAPI_CACHE_DIR'] = os.path.join(scratch.name, 'pokeapi_cache')
+    os.environ['POKEAPI_CACHE_TTL'] = '0'
+    os.environ['CUSTOM_GAME_STORE'] = 'memory'
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    import pokemon
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # No access log line per request
+
+    results = {
+        'meta': {
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'dataset': pokemon.current_snapshot().dataset.get('hash'),
+            'stub_latency_ms': args.stub_latency_ms,
+        },
+    }
+    if not args.skip_micro:
+        print('Micro-benchmarks')
+        results['micro'] = run_micro(pokemon)
+    if not args.skip_load:
+        server = None
+        base_url = args.url
+        if not base_url:
+            from werkzeug.serving import make_server
+            server = make_server('127.0.0.1', 0, pokemon.app, threaded=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f'http://127.0.0.1:{server.server_port}'
+        print(f'Load test: {args.clients} clients for {args.duration:g}s against {base_url}')
+        results['load'] = run_load(pokemon, base_url.rstrip('/'), args.duration, args.clients, args.seed)
+        results['load']['pokeapi_stub_requests'] = stub.requests
+        if server:
+            server.shutdown()
+    stub.shutdown()
+    scratch.cleanup()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f'Results written to {args.output}')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Per-worker memory of a pre-fork deployment, with and without preloading.
+
+Mimics gunicorn in a fresh interpreter per mode: a master forks --workers
+children, each serves --requests requests of the bench_suite mix through the
+test client and runs a full garbage collection (as a long-lived worker
+eventually does), then the master reads every worker's RSS, PSS and private
+(USS) memory from /proc/<pid>/smaps_rollup. Linux only.
+
+    no-preload       each worker imports the app itself (gunicorn default)
+    preload          the master imports pokemon before forking (preload_app)
+    preload+freeze   the master calls create_app(), as gunicorn.conf.py does
+
+    python benchmarks/bench_workers.py [--workers 4] [--requests 2000] [--output workers.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pokeapi_stub  # noqa: E402
+
+MODES = ('no-preload', 'preload', 'preload+freeze')
+
+CHILD = r'''
+import gc, json, os, signal, sys
+mode, workers, requests = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+sys.path.insert(0, 'benchmarks')
+if mode != 'no-preload':
+    import pokemon
+    if mode == 'preload+freeze':
+        pokemon.create_app()
+
+def serve(ready):
+    import pokemon
+    from bench_suite import Workload
+    client = pokemon.app.test_client()
+    workload = Workload(pokemon, os.getpid())
+    for _ in range(requests):
+        kind, method, path, payload, headers = workload.next(None)
+        if method == 'POST':
+            client.post(path, json=payload, headers=headers)
+        else:
+            client.get(path, query_string=payload, headers=headers)
+    gc.collect()
+    os.write(ready, b'.')
+    signal.pause()
+
+def memory(pid):
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {'rss_kb': values['Rss'], 'pss_kb': values['Pss'],
+            'uss_kb': values['Private_Clean'] + values['Private_Dirty']}
+
+read_end, write_end = os.pipe()
+pids = []
+for _ in range(workers):
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        serve(write_end)
+    pids.append(pid)
+os.close(write_end)
+for _ in range(workers):
+    os.read(read_end, 1)
+result = {'master': memory(os.getpid()), 'workers': [memory(pid) for pid in pids]}
+for pid in pids:
+    os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+json.dump(result, sys.stdout)
+'''
+
+def measure(mode, workers, requests):
+    out = subprocess.run([sys.executable, '-c', CHILD, mode, str(workers), str(requests)], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out[out.rindex('{"master"'):])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=2000, help='requests served by each worker before measuring')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    # Guesses whose measurements need PokéAPI go to a local stub
+    stub, stub_url = pokeapi_stub.start()
+    scratch = tempfile.TemporaryDirectory()
+    os.environ['POKEAPI_BASE_URL'] = stub_url
+    os.environ['POKEAPI_CACHE_DIR'] = scratch.name
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ['CUSTOM_GAME_STORE'] = 'memory'
+
+    results = {'workers': args.workers, 'requests_per_worker': args.requests, 'modes': {}}
+    print(f'{args.workers} workers, {args.requests} requests each; per-worker averages in MB')
+    print(f'  {"mode":<16} {"RSS":>7} {"PSS":>7} {"USS":>7}   total PSS incl. master')
+    for mode in MODES:
+        sample = measure(mode, args.workers, args.requests)
+        workers = sample['workers']
+        summary = {key: sum(w[key] for w in workers) / len(workers) / 1024 for key in ('rss_kb', 'pss_kb', 'uss_kb')}
+        summary['total_pss_mb'] = (sum(w['pss_kb'] for w in workers) + sample['master']['pss_kb']) / 1024
+        results['modes'][mode] = dict(sample, summary={key.replace('_kb', '_mb'): value for key, value in summary.items()})
+        print(f'  {mode:<16} {summary["rss_kb"]:7.1f} {summary["pss_kb"]:7.1f} {summary["uss_kb"]:7.1f}   '
+              f'{summary["total_pss_mb"]:.1f}')
+    stub.shutdown()
+    scratch.cleanup()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Local stand-in for pokeapi.co, so PokéAPI fallback paths can be measured offline.
+
+Serves GET /api/v2/pokemon/<name> with plausible weight (hectograms) and
+height (decimetres): the dataset's values for known names, deterministic
+made-up ones otherwise. Names starting with "missing" get a 404. Responses
+carry an ETag and honour If-None-Match, like the real API behind its CDN.
+Their sprite URLs point back at the stub (/sprites/<name>.png), which serves
+a small generated PNG. /api/v2/pokemon-species lists the dataset's species,
+and /api/v2/pokemon-species/<name> has made-up flavor texts (English and
+Japanese; about one species in 16 has no English text), enough for
+build_pokedex_entries.py.
+
+    python benchmarks/pokeapi_stub.py [--port 8765] [--latency-ms 50]
+    POKEAPI_BASE_URL=http://127.0.0.1:8765/api/v2 python pokemon.py
+
+or from a benchmark:
+
+    server, base_url = pokeapi_stub.start(latency_ms=50)
+    ...
+    server.shutdown()
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pokemon_dataset  # noqa: E402
+
+PREFIX = '/api/v2/pokemon/'
+SPECIES_PREFIX = '/api/v2/pokemon-species'
+SPRITE_PREFIX = '/sprites/'
+SPRITE_SIZE = 96
+
+_measurements = None
+
+def get_measurements():
+    """{api name: (weight hg, height dm)} from the compiled dataset."""
+    global _measurements
+    if _measurements is None:
+        data = pokemon_dataset.get_dataset()
+        _measurements = {}
+        for p in pokemon_dataset.load_records(pokemon_dataset.PokemonRecord, data['pokemon_fields'], data['pokemon']):
+            if p.weight and p.height:
+                _measurements[p.api_name] = (round(p.weight * 10), round(p.height * 10))
+    return _measurements
+
+def pokemon_body(name, sprite_base=''):
+    """JSON body for /pokemon/<name>, or None for a 404."""
+    if name.startswith('missing'):
+        return None
+    weight_height = get_measurements().get(name)
+    if weight_height is None:
+        digest = hashlib.sha256(name.encode('utf-8')).digest()
+        weight_height = (1 + int.from_bytes(digest[:2], 'big') % 3000, 1 + digest[2] % 60)
+    sprite = f'{sprite_base}{SPRITE_PREFIX}{name}.png'
+    sprites = {'front_default': sprite, 'other': {'official-artwork': {'front_default': sprite}, 'home': {'front_default': None}}}
+    return json.dumps({'name': name, 'weight': weight_height[0], 'height': weight_height[1], 'sprites': sprites}).encode('utf-8')
+
+def species_body(path):
+    """JSON body for /pokemon-species[?...] or /pokemon-species/<name>, or None for a 404."""
+    data = pokemon_dataset.get_dataset()
+    species = sorted({row[data['pokemon_fields'].index('species')] for row in data['pokemon']})
+    name = path.split('?')[0].strip('/')
+    if not name:
+        # Links use PokéAPI's own host, as the real list does; the client maps them to its base URL
+        results = [{'name': s, 'url': f'https://pokeapi.co/api/v2/pokemon-species/{s}/'} for s in species]
+        return json.dumps({'count': len(results), 'results': results}).encode('utf-8')
+    if name not in species:
+        return None
+    entries = [{'flavor_text': f'{name} has a stub entry\fin {version}.', 'language': {'name': 'en'}}
+               for version in ('red', 'blue', 'red')]
+    if hashlib.sha256(name.encode('utf-8')).digest()[0] < 16:
+        entries = []
+    entries.append({'flavor_text': f'{name} (ja)', 'language': {'name': 'ja'}})
+    return json.dumps({'name': name, 'flavor_text_entries': entries}).encode('utf-8')
+
+def png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+def sprite_png(name):
+    """A solid SPRITE_SIZE square in a colour derived from the name."""
+    colour = hashlib.sha256(name.encode('utf-8')).digest()[:3]
+    rows = b''.join(b'\x00' + colour * SPRITE_SIZE for _ in range(SPRITE_SIZE))
+    header = struct.pack('>IIBBBBB', SPRITE_SIZE, SPRITE_SIZE, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', header) + png_chunk(b'IDAT', zlib.compress(rows)) + png_chunk(b'IEND', b'')
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the pooled client expects
+
+    def do_GET(self):
+        self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = None
+        content_type = 'application/json'
+        if self.path.startswith(SPECIES_PREFIX):
+            body = species_body(unquote(self.path[len(SPECIES_PREFIX):]).lower())
+        elif self.path.startswith(PREFIX):
+            body = pokemon_body(unquote(self.path[len(PREFIX):]).strip('/').lower(), f"http://{self.headers['Host']}")
+        elif self.path.startswith(SPRITE_PREFIX) and self.path.endswith('.png'):
+            body = sprite_png(unquote(self.path[len(SPRITE_PREFIX):-len('.png')]))
+            content_type = 'image/png'
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '9')
+            self.end_headers()
+            self.wfile.write(b'Not Found')
+            return
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(host='127.0.0.1', port=0, latency_ms=0):
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency_ms / 1000.0
+    server.requests = 0
+    return server
+
+def start(host='127.0.0.1', port=0, latency_ms=0):
+    """Serve in a background thread; returns (server, base URL for POKEAPI_BASE_URL)."""
+    get_measurements()
+    server = make_server(host, port, latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}/api/v2'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0, help='delay added to every response')
+    args = parser.parse_args(argv)
+    get_measurements()
+    server = make_server(args.host, args.port, args.latency_ms)
+    print(f'PokéAPI stub on http://{args.host}:{server.server_address[1]}/api/v2')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
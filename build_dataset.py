@@ -0,0 +1,357 @@
+"""Compile the Pokémon data sources into pokemon_dataset.json.
+
+Sources: the National Pokédex CSV, special_forms_cache.json (regional and other
+forms, fetched from PokéAPI when missing) and pokemon_data.json (weights and
+heights, see generate_pokemon_cache.py). Re-run after changing any of them:
+
+    python build_dataset.py [--refresh-special-forms]
+
+Only this script (and the app's refresh-data command) talks to PokéAPI;
+compiling itself is offline.
+"""
+import argparse
+import csv
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+import pokeapi_client
+import pokemon_dataset
+from pokemon_dataset import canonical_name, display_name, build_cache_index, POKEMON_FIELDS, CACHE_FIELDS, DATASET_FORMAT
+
+def load_pokemon(csv_path):
+    pokemon = []
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            try:
+                generation = int(row['gen'])
+            except ValueError:
+                continue  # Skip rows where 'gen' is not an integer
+            name = row['Pokemon'].strip().lower()
+            # Normalize Nidoran names for file/image compatibility
+            if name in ['nidoran♀', 'nidoran♀.', 'nidoran ♀', 'nidoran ♀.']:
+                name = 'nidoranfemale'
+            elif name in ['nidoran♂', 'nidoran♂.', 'nidoran ♂', 'nidoran ♂.']:
+                name = 'nidoranmale'
+            # Try to get weight and height if present in CSV
+            try:
+                weight = float(row.get('Weight', '') or 0)
+            except Exception:
+                weight = None
+            try:
+                height = float(row.get('Height', '') or 0)
+            except Exception:
+                height = None
+            pokemon.append({
+                'name': name,
+                'generation': generation,
+                'type1': row['Type I'].strip().lower(),
+                'type2': row['Type II'].strip().lower() if row['Type II'] else row['Type I'].strip().lower(),
+                'weight': weight,
+                'height': height
+            })
+    return pokemon
+
+CSV_FILE = pokemon_dataset.SOURCE_FILES['csv']
+
+# --- Supplement with special forms from PokéAPI if missing ---
+SPECIAL_FORMS = [
+    # Alolan forms (Gen 7)
+    ("Rattata Alola", "rattata-alola"),
+    ("Raticate Alola", "raticate-alola"),
+    ("Raichu Alola", "raichu-alola"),
+    ("Sandshrew Alola", "sandshrew-alola"),
+    ("Sandslash Alola", "sandslash-alola"),
+    ("Vulpix Alola", "vulpix-alola"),
+    ("Ninetales Alola", "ninetales-alola"),
+    ("Diglett Alola", "diglett-alola"),
+    ("Dugtrio Alola", "dugtrio-alola"),
+    ("Meowth Alola", "meowth-alola"),
+    ("Persian Alola", "persian-alola"),
+    ("Geodude Alola", "geodude-alola"),
+    ("Graveler Alola", "graveler-alola"),
+    ("Golem Alola", "golem-alola"),
+    ("Grimer Alola", "grimer-alola"),
+    ("Muk Alola", "muk-alola"),
+    ("Exeggutor Alola", "exeggutor-alola"),
+    ("Marowak Alola", "marowak-alola"),
+    # Galarian forms (Gen 8)
+    ("Meowth Galar", "meowth-galar"),
+    ("Ponyta Galar", "ponyta-galar"),
+    ("Rapidash Galar", "rapidash-galar"),
+    ("Slowpoke Galar", "slowpoke-galar"),
+    ("Slowbro Galar", "slowbro-galar"),
+    ("Farfetch'd Galar", "farfetchd-galar"),
+    ("Weezing Galar", "weezing-galar"),
+    ("Mr. Mime Galar", "mr-mime-galar"),
+    ("Corsola Galar", "corsola-galar"),
+    ("Zigzagoon Galar", "zigzagoon-galar"),
+    ("Linoone Galar", "linoone-galar"),
+    ("Darumaka Galar", "darumaka-galar"),
+    ("Darmanitan Galar Standard", "darmanitan-galar-standard"),
+    ("Yamask Galar", "yamask-galar"),
+    ("Stunfisk Galar", "stunfisk-galar"),
+    ("Articuno Galar", "articuno-galar"),
+    ("Zapdos Galar", "zapdos-galar"),
+    ("Moltres Galar", "moltres-galar"),
+    # Hisuian forms (Gen 8)
+    ("Growlithe Hisui", "growlithe-hisui"),
+    ("Arcanine Hisui", "arcanine-hisui"),
+    ("Voltorb Hisui", "voltorb-hisui"),
+    ("Electrode Hisui", "electrode-hisui"),
+    ("Qwilfish Hisui", "qwilfish-hisui"),
+    ("Sneasel Hisui", "sneasel-hisui"),
+    ("Kleavor", "kleavor"),
+    ("Braviary Hisui", "braviary-hisui"),
+    ("Rufflet Hisui", "rufflet-hisui"),
+    ("Zorua Hisui", "zorua-hisui"),
+    ("Zoroark Hisui", "zoroark-hisui"),
+    ("Basculegion", "basculegion"),
+    ("Basculegion Female", "basculegion-female"),
+    # Paldean forms (Gen 9)
+    ("Tauros Paldea Combat", "tauros-paldea-combat-breed"),
+    ("Tauros Paldea Blaze", "tauros-paldea-blaze-breed"),
+    ("Tauros Paldea Aqua", "tauros-paldea-aqua-breed"),
+    ("Wooper Paldea", "wooper-paldea"),
+    # Lycanroc forms (Gen 7)
+    ("Lycanroc Midday", "lycanroc-midday"),
+    ("Lycanroc Midnight", "lycanroc-midnight"),
+    ("Lycanroc Dusk", "lycanroc-dusk"),
+    # Other forms
+    ("Sneasler", "sneasler"),
+    ("Overqwil", "overqwil"),
+    # Ursaluna forms
+    ("Ursaluna", "ursaluna"),
+    # Removed Ursaluna Bloodmoon and Keldeo forms
+]
+
+SPECIAL_FORMS_CACHE = pokemon_dataset.SOURCE_FILES['special_forms']
+
+def fetch_and_cache_special_forms():
+    """Refresh special_forms_cache.json from PokéAPI; returns how many forms were fetched.
+
+    Forms that cannot be fetched keep their previously cached entry, so a
+    network outage never replaces the last good snapshot with a partial one.
+    """
+    previous = {}
+    if has_special_forms_cache():
+        previous = {entry['name']: entry for entry in load_json(SPECIAL_FORMS_CACHE)}
+    cache = []
+    fetched = 0
+    for display, api_name in SPECIAL_FORMS:
+        norm_name = api_name.replace('-', ' ')
+        try:
+            resp = pokeapi_client.get(f'pokemon/{api_name}')
+        except Exception as e:
+            print(f'Failed to fetch {api_name}: {e}')
+            resp = None
+        if resp is None or resp.status_code != 200:
+            if norm_name in previous:
+                cache.append(previous[norm_name])
+            continue
+        poke = resp.json()
+        types = [t['type']['name'] for t in poke['types']]
+        weight = poke['weight']
+        height = poke['height']
+        species_url = poke['species']['url']
+        gen = None
+        try:
+            species_resp = pokeapi_client.get(species_url)
+            if species_resp.status_code == 200:
+                species_data = species_resp.json()
+                gen = pokeapi_client.generation_number(species_data['generation']['name'])
+                # Force Paldean forms to Gen 9 (handle both 'paldea' and 'paldean')
+                if 'paldea' in api_name or 'paldean' in api_name:
+                    gen = 9
+                if gen == 1:
+                    if 'alola' in api_name:
+                        gen = 7
+                    elif 'galar' in api_name or 'hisui' in api_name:
+                        gen = 8
+                    elif 'paldea' in api_name or 'paldean' in api_name:
+                        gen = 9
+        except Exception:
+            pass
+        type1 = types[0] if len(types) > 0 else ''
+        type2 = types[1] if len(types) > 1 else ''
+        cache.append({
+            'name': norm_name,
+            'generation': gen,
+            'type1': type1,
+            'type2': type2,
+            'types': types,
+            'weight': weight,
+            'height': height,
+            'display': display
+        })
+        fetched += 1
+    write_json(SPECIAL_FORMS_CACHE, cache, indent=2)
+    return fetched
+
+POKEMON_CACHE_FILE = pokemon_dataset.SOURCE_FILES['pokemon_data']
+
+def load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def species_key(name, base_names):
+    # Longest leading run of words that names a base species, e.g. 'mr mime galar' -> 'mrmime'
+    words = name.replace('-', ' ').split()
+    for i in range(len(words), 0, -1):
+        key = canonical_name(' '.join(words[:i]))
+        if key in base_names:
+            return key
+    return canonical_name(name)
+
+def to_metric(value):
+    # PokéAPI and the cache store decagrams/decimetres; 0 means unknown
+    if value in (None, 0, ''):
+        return None
+    return value / 10.0
+
+# PokéAPI names the dataset name does not spell out
+API_NAME_OVERRIDES = {
+    'nidoranfemale': 'nidoran-f',
+    'nidoranmale': 'nidoran-m',
+    'shaymin': 'shaymin-land',
+    'meloetta (a)': 'meloetta-aria',
+    'zygarde 50%': 'zygarde-50',
+}
+
+def api_name_for(name, cache_entry):
+    # The cache entry's name is PokéAPI's own; otherwise slug the dataset name
+    if cache_entry and cache_entry.get('api_name'):
+        return cache_entry['api_name']
+    if name in API_NAME_OVERRIDES:
+        return API_NAME_OVERRIDES[name]
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9-]', '', re.sub(r'\s+', '-', ascii_name.strip().lower()))
+
+def dataset_hash(data):
+    payload = {k: v for k, v in data.items() if k != 'hash'}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def carry_calendar(previous):
+    """{ISO date: name} of the target previous served on each started day of the archive window.
+
+    A pick is otherwise a seed modulo the row count, so adding or removing a
+    row would change today's target, every archive day and the target of
+    boards players restore. Tomorrow (anywhere) is included too, so a build
+    that is loaded shortly after it finishes still has that day recorded.
+    """
+    if not previous or not previous.get('pokemon'):
+        return {}
+    names = [row[previous['pokemon_fields'].index('name')] for row in previous['pokemon']]
+    known = set(names)
+    recorded = previous.get('calendar', {})
+    last = pokemon_dataset.last_started_day() + datetime.timedelta(days=1)
+    calendar = {}
+    # Local days lag the last started one by up to two days (UTC-12)
+    for i in range(pokemon_dataset.CALENDAR_PAST_DAYS + 4):
+        day = last - datetime.timedelta(days=i)
+        name = recorded.get(day.isoformat())
+        calendar[day.isoformat()] = name if name in known else names[pokemon_dataset.daily_index(day, len(names))]
+    return dict(sorted(calendar.items()))
+
+def read_previous(path=pokemon_dataset.DATASET_FILE):
+    try:
+        return pokemon_dataset.read_dataset(path)
+    except (OSError, ValueError):
+        return None
+
+def has_special_forms_cache():
+    return os.path.exists(SPECIAL_FORMS_CACHE) and os.stat(SPECIAL_FORMS_CACHE).st_size > 0
+
+def compile_dataset(previous=None):
+    """Merge the three sources into the compact, resolved dataset dict.
+
+    Never touches the network: without special_forms_cache.json the special
+    forms are simply left out (see refresh_dataset). previous is the dataset
+    being replaced, whose daily picks are carried forward (see carry_calendar).
+    """
+    pokemon_list = load_pokemon(CSV_FILE)
+    special_forms_data = load_json(SPECIAL_FORMS_CACHE) if has_special_forms_cache() else []
+    cache = load_json(POKEMON_CACHE_FILE)
+
+    existing_names = set()
+    for p in pokemon_list:
+        p['canonical'] = canonical_name(p['name'])
+        existing_names.add(p['canonical'])
+    base_names = set(existing_names)
+    for entry in special_forms_data:
+        entry['canonical'] = canonical_name(entry['name'])
+        if entry['canonical'] not in existing_names:
+            pokemon_list.append(entry)
+            existing_names.add(entry['canonical'])
+
+    cache_index = build_cache_index(cache)
+    pokemon_rows = []
+    for p in pokemon_list:
+        # Prefer the cache's measurements, then the entry's own (special forms carry PokéAPI values)
+        cache_entry = source = cache_index.get(pokemon_dataset.normalize_name(p['name']))
+        if not source or to_metric(source.get('weight')) is None or to_metric(source.get('height')) is None:
+            source = p
+        p = dict(p, display=display_name(p['name']), species=species_key(p['name'], base_names),
+                 api_name=api_name_for(p['name'], cache_entry),
+                 weight=to_metric(source.get('weight')), height=to_metric(source.get('height')))
+        pokemon_rows.append([p[field] for field in POKEMON_FIELDS])
+
+    cache_rows = []
+    for entry in cache:
+        entry = dict(entry, weight=to_metric(entry.get('weight')), height=to_metric(entry.get('height')))
+        cache_rows.append([entry.get(field) for field in CACHE_FIELDS])
+    row_of = {id(entry): i for i, entry in enumerate(cache)}
+
+    data = {
+        'format': DATASET_FORMAT,
+        'sources': pokemon_dataset.source_hashes(),
+        'pokemon_fields': POKEMON_FIELDS,
+        'pokemon': pokemon_rows,
+        'cache_fields': CACHE_FIELDS,
+        'cache': cache_rows,
+        'cache_index': {alias: row_of[id(entry)] for alias, entry in cache_index.items()},
+        'calendar': carry_calendar(previous),
+    }
+    data['hash'] = dataset_hash(data)
+    return data
+
+def write_json(path, data, **kwargs):
+    # Write to a temp file and rename so readers never see a partial file. The
+    # temp name is unique per process and thread: a CLI build and a scheduled
+    # refresh running at once must not write into each other's temp file.
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, **kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_dataset(data, path=pokemon_dataset.DATASET_FILE):
+    write_json(path, data, separators=(',', ':'))
+
+def refresh_dataset(path=pokemon_dataset.DATASET_FILE):
+    """Refetch the special forms from PokéAPI, then rebuild and write the dataset."""
+    fetched = fetch_and_cache_special_forms()
+    data = compile_dataset(read_previous(path))
+    write_dataset(data, path)
+    print(f'Fetched {fetched}/{len(SPECIAL_FORMS)} special forms; dataset hash {data["hash"][:12]}')
+    return data
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile the Pokémon data sources into pokemon_dataset.json.')
+    parser.add_argument('--refresh-special-forms', action='store_true', help='refetch special_forms_cache.json from PokéAPI first')
+    args = parser.parse_args()
+    # Fetch the special forms when asked to, or when there is no cache to build from yet
+    if args.refresh_special_forms or not has_special_forms_cache():
+        fetch_and_cache_special_forms()
+    data = compile_dataset(read_previous())
+    write_dataset(data)
+    print(f"Wrote {len(data['pokemon'])} Pokémon and {len(data['cache'])} cache entries to {pokemon_dataset.DATASET_FILE} (hash {data['hash'][:12]})")
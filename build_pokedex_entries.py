@@ -0,0 +1,70 @@
+"""Build pokedex_entries.json, the local store behind /pokedex_entry/<name>.
+
+For every species in the dataset, fetch its PokéAPI pokemon-species document
+once and keep only the distinct English flavor texts. Species PokéAPI has no
+English text for are stored with an empty list, so the app can tell them
+apart from species this build failed to fetch:
+
+    python build_pokedex_entries.py [--workers 8]
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import build_dataset
+import pokeapi_client
+import pokemon_dataset
+from pokemon_dataset import DEFAULT_FORMS, normalize_name
+
+ENTRIES_FILE = os.path.join(os.path.dirname(__file__), 'pokedex_entries.json')
+
+def english_flavor_texts(species_detail):
+    texts = []
+    for entry in species_detail.get('flavor_text_entries', []):
+        if entry['language']['name'] != 'en':
+            continue
+        # Game text uses form feeds and hard line breaks
+        text = ' '.join(entry['flavor_text'].replace('\f', ' ').split())
+        if text not in texts:
+            texts.append(text)
+    return texts
+
+def species_urls(dataset):
+    """Dataset species key -> PokéAPI pokemon-species URL."""
+    by_name = {normalize_name(s['name']): s['url'] for s in pokeapi_client.get_json('pokemon-species?limit=10000')['results']}
+    fields = dataset['pokemon_fields']
+    urls = {}
+    for row in dataset['pokemon']:
+        species = row[fields.index('species')]
+        key = DEFAULT_FORMS.get(species, species)
+        if key in by_name:
+            urls[species] = by_name[key]
+        elif species in by_name:
+            urls[species] = by_name[species]
+    return urls
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=8, help='concurrent species fetches (default 8)')
+    args = parser.parse_args(argv)
+
+    urls = species_urls(pokemon_dataset.load_dataset())
+    entries = {}
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(pokeapi_client.get_json, url): species for species, url in urls.items()}
+        for future in as_completed(futures):
+            species = futures[future]
+            try:
+                detail = future.result()
+            except Exception as e:
+                print(f'Failed {species}: {e}')
+                continue
+            if detail:
+                entries[species] = english_flavor_texts(detail)
+
+    build_dataset.write_json(ENTRIES_FILE, dict(sorted(entries.items())), separators=(',', ':'))
+    print(f'Saved Pokédex entries for {len(entries)} of {len(urls)} species to {os.path.basename(ENTRIES_FILE)}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
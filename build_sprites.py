@@ -0,0 +1,188 @@
+"""Build resized sprite derivatives for static/pokemon/*.png.
+
+For every source sprite this writes a thumbnail (autocomplete) and a medium
+(guess list, reveal modal) variant, each as WebP plus a PNG fallback, under
+static/sprites/<size>/<name>.<hash>.<ext>. The hash is derived from the source
+file and the build settings, so URLs change whenever the content does and the
+files can be cached forever. static/sprites/manifest.json maps each sprite
+name to its hash. Files the new manifest no longer uses are kept for
+--grace-hours after the build that retired them, then deleted.
+
+A 48px icon of every sprite is also packed into one atlas sheet
+(static/sprites/atlas/) so the autocomplete dropdown can draw every icon from
+a single cached image; the manifest's 'atlas' section records each sprite's
+cell in it.
+
+    python build_sprites.py [--workers N] [--grace-hours H]
+
+Requires Pillow (pip install pillow).
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+SOURCE_DIR = os.path.join(os.path.dirname(__file__), 'static', 'pokemon')
+SPRITES_DIR = os.path.join(os.path.dirname(__file__), 'static', 'sprites')
+MANIFEST_FILE = os.path.join(SPRITES_DIR, 'manifest.json')
+# Pixel box per variant; the UI shows them at half size for high-DPI screens
+SIZES = {'thumb': 80, 'medium': 240}
+BUILD_VERSION = 1
+WEBP_QUALITY = 85
+# Atlas cells are 48px (icons render at 40px); 32 columns keeps the decoded
+# sheet around 10 MB of bitmap for the full dex
+ATLAS_CELL = 48
+ATLAS_COLUMNS = 32
+ATLAS_VERSION = 2
+ATLAS_DIR = os.path.join(SPRITES_DIR, 'atlas')
+# Files dropped from the manifest stay this long: pages and /sprite_manifest
+# responses (cached for an hour, and held by a running server until it
+# restarts) still point at the previous generation
+STALE_GRACE_HOURS = 24
+
+def sprite_hash(source_bytes):
+    settings = json.dumps({'sizes': SIZES, 'version': BUILD_VERSION, 'quality': WEBP_QUALITY}, sort_keys=True)
+    return hashlib.sha256(source_bytes + settings.encode()).hexdigest()[:10]
+
+def variant_path(size_name, name, digest, ext):
+    return os.path.join(SPRITES_DIR, size_name, f'{name}.{digest}.{ext}')
+
+def encode_variants(image, box):
+    image = image.copy()
+    image.thumbnail((box, box), Image.LANCZOS)
+    webp = io.BytesIO()
+    image.save(webp, 'WEBP', quality=WEBP_QUALITY)
+    png = io.BytesIO()
+    # Sprites use few colours, so a 256-colour palette keeps the fallback small
+    image.quantize(colors=256, method=Image.FASTOCTREE).save(png, 'PNG', optimize=True)
+    return webp.getvalue(), png.getvalue()
+
+def build_one(file_name):
+    """Write all variants of one source sprite; returns (name, hash, bytes written)."""
+    name = file_name[:-len('.png')]
+    with open(os.path.join(SOURCE_DIR, file_name), 'rb') as f:
+        source = f.read()
+    digest = sprite_hash(source)
+    written = 0
+    image = None
+    for size_name, box in SIZES.items():
+        paths = {ext: variant_path(size_name, name, digest, ext) for ext in ('webp', 'png')}
+        if all(os.path.exists(p) for p in paths.values()):
+            continue  # Unchanged since the last build
+        if image is None:
+            image = Image.open(io.BytesIO(source)).convert('RGBA')
+        for ext, data in zip(('webp', 'png'), encode_variants(image, box)):
+            with open(paths[ext], 'wb') as f:
+                f.write(data)
+            written += len(data)
+    return name, digest, written
+
+def remove_expired(directory, keep, retiring, grace_seconds):
+    """Delete files in directory that are neither kept nor still within their grace period.
+
+    Files in retiring (referenced by the previous manifest) are touched instead:
+    their mtime marks when they were retired.
+    """
+    now = time.time()
+    removed = 0
+    for file_name in os.listdir(directory):
+        if file_name in keep:
+            continue
+        path = os.path.join(directory, file_name)
+        if file_name in retiring:
+            os.utime(path, (now, now))
+        elif now - os.path.getmtime(path) > grace_seconds:
+            os.remove(path)
+            removed += 1
+    return removed
+
+def variant_names(sprites):
+    return {f'{name}.{digest}.{ext}' for name, digest in sprites.items() for ext in ('webp', 'png')}
+
+def remove_stale(sprites, previous_sprites, grace_seconds):
+    # Drop derivatives of sprites that changed or disappeared, once the grace period is over
+    keep = variant_names(sprites)
+    retiring = variant_names(previous_sprites) - keep
+    return sum(remove_expired(os.path.join(SPRITES_DIR, size_name), keep, retiring, grace_seconds) for size_name in SIZES)
+
+def atlas_key(sprites):
+    return hashlib.sha256(json.dumps([sorted(sprites.items()), ATLAS_CELL, ATLAS_COLUMNS, ATLAS_VERSION]).encode()).hexdigest()[:10]
+
+def build_atlas(sprites, previous=None):
+    """Pack an icon of every sprite into one sheet; returns the manifest's 'atlas' section."""
+    key = atlas_key(sprites)
+    if previous and previous.get('key') == key and all(
+            os.path.exists(os.path.join(SPRITES_DIR, path)) for path in previous['sheet'].values()):
+        return previous  # Same sprites as last time
+    names = sorted(sprites)
+    rows = (len(names) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+    sheet = Image.new('RGBA', (ATLAS_COLUMNS * ATLAS_CELL, rows * ATLAS_CELL))
+    cells = {}
+    for i, name in enumerate(names):
+        # Resized from the source: the PNG thumbnail is already quantized
+        thumb = Image.open(os.path.join(SOURCE_DIR, f'{name}.png')).convert('RGBA')
+        thumb.thumbnail((ATLAS_CELL, ATLAS_CELL), Image.LANCZOS)
+        # Each icon gets its own 256-colour palette; one palette shared by the
+        # whole dex visibly degraded them. The sheet itself stays RGBA.
+        thumb = thumb.quantize(colors=256, method=Image.FASTOCTREE).convert('RGBA')
+        x = (i % ATLAS_COLUMNS) * ATLAS_CELL
+        y = (i // ATLAS_COLUMNS) * ATLAS_CELL
+        # Centre the icon in its cell
+        sheet.paste(thumb, (x + (ATLAS_CELL - thumb.width) // 2, y + (ATLAS_CELL - thumb.height) // 2))
+        cells[name] = [x, y]
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    paths = {}
+    # Few colours per cell compress far better losslessly than lossy WebP does
+    for ext, options in (('webp', {'lossless': True}), ('png', {'optimize': True})):
+        buf = io.BytesIO()
+        sheet.save(buf, ext.upper(), **options)
+        digest = hashlib.sha256(buf.getvalue()).hexdigest()[:10]
+        paths[ext] = f'atlas/atlas.{digest}.{ext}'
+        with open(os.path.join(SPRITES_DIR, paths[ext]), 'wb') as f:
+            f.write(buf.getvalue())
+    return {'key': key, 'cell': ATLAS_CELL, 'width': sheet.width, 'height': sheet.height, 'sheet': paths, 'sprites': cells}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build resized WebP/PNG sprite derivatives and their manifest.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='parallel encoder processes')
+    parser.add_argument('--grace-hours', type=float, default=STALE_GRACE_HOURS,
+                        help='keep files of the previous build this long before deleting them')
+    args = parser.parse_args(argv)
+    grace_seconds = args.grace_hours * 3600
+
+    previous = {}
+    if os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE, encoding='utf-8') as f:
+            previous = json.load(f)
+
+    for size_name in SIZES:
+        os.makedirs(os.path.join(SPRITES_DIR, size_name), exist_ok=True)
+    sources = sorted(f for f in os.listdir(SOURCE_DIR) if f.endswith('.png'))
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(build_one, sources, chunksize=16))
+    sprites = {name: digest for name, digest, _ in results}
+    removed = remove_stale(sprites, previous.get('sprites', {}), grace_seconds)
+    atlas = build_atlas(sprites, previous.get('atlas'))
+    # Previous sheets outlive the rebuild like the derivatives do
+    keep = {os.path.basename(path) for path in atlas['sheet'].values()}
+    retiring = {os.path.basename(path) for path in (previous.get('atlas') or {}).get('sheet', {}).values()} - keep
+    removed += remove_expired(ATLAS_DIR, keep, retiring, grace_seconds)
+
+    manifest = {'version': BUILD_VERSION, 'sizes': SIZES, 'sprites': sprites, 'atlas': atlas}
+    tmp_path = MANIFEST_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, MANIFEST_FILE)
+    written = sum(w for _, _, w in results)
+    print(f'{len(sprites)} sprites, {written / 1e6:.1f} MB written, {removed} expired files removed')
+    sheet_sizes = {ext: os.path.getsize(os.path.join(SPRITES_DIR, path)) for ext, path in atlas['sheet'].items()}
+    print(f"Atlas {atlas['width']}x{atlas['height']}: " + ', '.join(f'{ext} {size / 1e3:.0f} KB' for ext, size in sheet_sizes.items()))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Persistent storage for custom game codes (code -> canonical Pokémon name).
+
+The app talks to a store through three methods, create(), get() and
+purge_expired(), so the backend can be swapped with CUSTOM_GAME_STORE:
+
+    sqlite:///path/to/file.sqlite3   (default: custom_games.sqlite3 next to the app)
+    memory                           (single process, nothing persisted)
+
+SQLiteGameStore is safe to share between gunicorn workers: inserts are single
+rows in WAL mode, so readers never block and every worker sees every code.
+Codes are immutable once written, so each process keeps recently read ones in
+a small LRU and only goes to the database on a miss.
+
+New codes expire after CUSTOM_GAME_TTL_DAYS (default 90, 0 keeps them
+forever); expired rows are ignored on read and deleted at most once an hour.
+Codes from the old custom_games.json are imported once and never expire.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import metrics
+
+DEFAULT_DB_FILE = os.path.join(os.path.dirname(__file__), 'custom_games.sqlite3')
+LEGACY_JSON_FILE = os.path.join(os.path.dirname(__file__), 'custom_games.json')
+DEFAULT_TTL = float(os.environ.get('CUSTOM_GAME_TTL_DAYS', 90)) * 24 * 3600
+CACHE_SIZE = 4096
+PURGE_INTERVAL = 3600
+STORE_OPERATIONS = metrics.counter('custom_game_store_operations_total', 'Custom game store operations by result.',
+                                   ['backend', 'operation', 'result'])
+
+def new_code():
+    return uuid.uuid4().hex[:12]
+
+class LRUCache:
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.items:
+                return None
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            if len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+class MemoryGameStore:
+    """Process-local store for development and benchmarks."""
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self.games = {}
+        self.lock = threading.Lock()
+
+    def create(self, pokemon, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl else None
+        with self.lock:
+            code = new_code()
+            while code in self.games:
+                code = new_code()
+            self.games[code] = (pokemon, expires)
+        STORE_OPERATIONS.labels(backend='memory', operation='create', result='ok').inc()
+        return code
+
+    def get(self, code):
+        pokemon, expires = self.games.get(code, (None, None))
+        if expires is not None and expires <= time.time():
+            STORE_OPERATIONS.labels(backend='memory', operation='get', result='expired').inc()
+            return None
+        STORE_OPERATIONS.labels(backend='memory', operation='get', result='hit' if pokemon else 'miss').inc()
+        return pokemon
+
+    def purge_expired(self):
+        now = time.time()
+        with self.lock:
+            expired = [code for code, (_, expires) in self.games.items() if expires is not None and expires <= now]
+            for code in expired:
+                del self.games[code]
+        return len(expired)
+
+class SQLiteGameStore:
+    def __init__(self, path=DEFAULT_DB_FILE, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.cache = LRUCache()
+        self.local = threading.local()
+        self.last_purge = 0
+        with self.connection() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS custom_games ('
+                       'code TEXT PRIMARY KEY, pokemon TEXT NOT NULL, created REAL NOT NULL, expires REAL)')
+            db.execute('CREATE INDEX IF NOT EXISTS custom_games_expires ON custom_games (expires)')
+            db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+
+    def connection(self):
+        # sqlite3 connections belong to one thread, and must not survive a fork
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or self.local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def create(self, pokemon, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires = now + ttl if ttl else None
+        db = self.connection()
+        while True:
+            code = new_code()
+            try:
+                with db:
+                    db.execute('INSERT INTO custom_games (code, pokemon, created, expires) VALUES (?, ?, ?, ?)',
+                               (code, pokemon, now, expires))
+                break
+            except sqlite3.IntegrityError:
+                continue  # Code collision; draw another
+        self.cache.put(code, (pokemon, expires))
+        STORE_OPERATIONS.labels(backend='sqlite', operation='create', result='ok').inc()
+        if now - self.last_purge > PURGE_INTERVAL:
+            self.purge_expired()
+        return code
+
+    def get(self, code):
+        cached = self.cache.get(code)
+        result = 'cache_hit'
+        if cached is None:
+            row = self.connection().execute(
+                'SELECT pokemon, expires FROM custom_games WHERE code = ?', (code,)).fetchone()
+            if row is None:
+                # Not cached: another worker may create it later
+                STORE_OPERATIONS.labels(backend='sqlite', operation='get', result='miss').inc()
+                return None
+            cached = tuple(row)
+            self.cache.put(code, cached)
+            result = 'db_hit'
+        pokemon, expires = cached
+        if expires is not None and expires <= time.time():
+            result = 'expired'
+            pokemon = None
+        STORE_OPERATIONS.labels(backend='sqlite', operation='get', result=result).inc()
+        return pokemon
+
+    def purge_expired(self):
+        self.last_purge = time.time()
+        with self.connection() as db:
+            removed = db.execute('DELETE FROM custom_games WHERE expires <= ?', (self.last_purge,)).rowcount
+        STORE_OPERATIONS.labels(backend='sqlite', operation='purge', result='ok').inc()
+        return removed
+
+    def migrate_json(self, json_path=LEGACY_JSON_FILE):
+        """Import codes from the old JSON file once; returns how many were added."""
+        if not os.path.exists(json_path):
+            return 0
+        db = self.connection()
+        with db:
+            # Only the first worker to get here imports; the rest see the marker
+            db.execute('BEGIN IMMEDIATE')
+            if db.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone():
+                return 0
+            with open(json_path, encoding='utf-8') as f:
+                games = json.load(f)
+            now = time.time()
+            added = db.executemany('INSERT OR IGNORE INTO custom_games (code, pokemon, created, expires) VALUES (?, ?, ?, NULL)',
+                                   [(code, pokemon, now) for code, pokemon in games.items()]).rowcount
+            db.execute("INSERT INTO meta (key, value) VALUES ('migrated_json', ?)", (str(now),))
+        return added
+
+def open_store(url=None):
+    """Store named by url (or CUSTOM_GAME_STORE), with the legacy JSON codes imported."""
+    url = url or os.environ.get('CUSTOM_GAME_STORE', 'sqlite:///' + DEFAULT_DB_FILE)
+    if url == 'memory':
+        return MemoryGameStore()
+    if url.startswith('sqlite:///'):
+        store = SQLiteGameStore(url[len('sqlite:///'):])
+        store.migrate_json()
+        return store
+    raise ValueError(f'Unknown custom game store: {url}')
@@ -0,0 +1,102 @@
+"""Stateless custom game codes: encrypted, authenticated tokens.
+
+A token carries the target's index in the dataset, a 64-bit check of its
+canonical name (so a rebuilt dataset with shifted indexes can still be
+matched) and an optional expiry. Any worker holding the secret can read it
+without a storage lookup, and the Pokémon stays hidden from players.
+
+Layout, base64url without padding (47 characters):
+
+    version (1) | nonce (8) | ciphertext (14) | tag (12)
+
+Version 1 tokens (39 characters, 16-bit name check) are still read; with
+~1000 names a 16-bit check alone is not unique, so callers must only trust it
+when the index agrees or the check matches a single name.
+
+The plaintext is XORed with HMAC-SHA256(enc_key, nonce) and the whole token
+is authenticated with a truncated HMAC-SHA256 under a separate key
+(encrypt-then-MAC), so only the standard library is needed.
+
+The secret comes from CUSTOM_GAME_SECRET, or from .custom_game_secret, which
+is created with random bytes on first use so every worker on a host agrees.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import struct
+import time
+
+SECRET_FILE = os.path.join(os.path.dirname(__file__), '.custom_game_secret')
+TOKEN_VERSION = 2
+NONCE_SIZE = 8
+TAG_SIZE = 12
+# Per version: dataset index, name check, expiry (unix seconds, 0 = never)
+PAYLOADS = {1: struct.Struct('>HHI'), 2: struct.Struct('>HQI')}
+CHECK_BYTES = {1: 2, 2: 8}
+TOKEN_SIZES = {version: 1 + NONCE_SIZE + payload.size + TAG_SIZE for version, payload in PAYLOADS.items()}
+
+_keys = None
+
+def load_secret():
+    secret = os.environ.get('CUSTOM_GAME_SECRET')
+    if secret:
+        return secret.encode()
+    try:
+        # O_EXCL: if several workers race, exactly one writes the secret
+        fd = os.open(SECRET_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(base64.b64encode(os.urandom(32)))
+    for _ in range(50):
+        with open(SECRET_FILE, 'rb') as f:
+            secret = f.read().strip()
+        if secret:
+            return secret
+        time.sleep(0.01)  # Another worker is still writing it
+    raise RuntimeError(f'{SECRET_FILE} is empty')
+
+def get_keys():
+    """(encryption key, MAC key), derived from the secret on first use."""
+    global _keys
+    if _keys is None:
+        secret = load_secret()
+        _keys = (hmac.new(secret, b'custom-game-enc', hashlib.sha256).digest(),
+                 hmac.new(secret, b'custom-game-mac', hashlib.sha256).digest())
+    return _keys
+
+def name_check(canonical, version=TOKEN_VERSION):
+    return int.from_bytes(hashlib.sha256(canonical.encode()).digest()[:CHECK_BYTES[version]], 'big')
+
+def _xor(data, nonce, enc_key):
+    stream = hmac.new(enc_key, nonce, hashlib.sha256).digest()
+    return bytes(a ^ b for a, b in zip(data, stream))
+
+def issue(index, canonical, ttl=None):
+    """Token for dataset row `index` (whose canonical name is `canonical`)."""
+    enc_key, mac_key = get_keys()
+    expires = int(time.time() + ttl) if ttl else 0
+    nonce = os.urandom(NONCE_SIZE)
+    body = bytes([TOKEN_VERSION]) + nonce + _xor(PAYLOADS[TOKEN_VERSION].pack(index, name_check(canonical), expires), nonce, enc_key)
+    tag = hmac.new(mac_key, body, hashlib.sha256).digest()[:TAG_SIZE]
+    return base64.urlsafe_b64encode(body + tag).rstrip(b'=').decode()
+
+def read(token):
+    """(dataset index, name check, token version) from a valid, unexpired token, else None."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    except (ValueError, TypeError):
+        return None
+    if not raw or len(raw) != TOKEN_SIZES.get(raw[0]):
+        return None
+    enc_key, mac_key = get_keys()
+    body, tag = raw[:-TAG_SIZE], raw[-TAG_SIZE:]
+    if not hmac.compare_digest(tag, hmac.new(mac_key, body, hashlib.sha256).digest()[:TAG_SIZE]):
+        return None
+    nonce = body[1:1 + NONCE_SIZE]
+    index, check, expires = PAYLOADS[raw[0]].unpack(_xor(body[1 + NONCE_SIZE:], nonce, enc_key))
+    if expires and expires <= time.time():
+        return None
+    return index, check, raw[0]
@@ -1,43 +1,154 @@
-import requests
-import json
+"""Rebuild pokemon_data.json (names, types, weight and height of every form) from PokéAPI.
+
+    python generate_pokemon_cache.py                  # full rebuild
+    python generate_pokemon_cache.py --incremental    # only species missing from, or stale in, pokemon_data.json
+    python generate_pokemon_cache.py --workers 16
 
-# Fetch all Pokémon species (for names, forms, and generations)
-species_url = 'https://pokeapi.co/api/v2/pokemon-species?limit=10000'
-species_resp = requests.get(species_url)
-species_data = species_resp.json()['results']
+Species are fetched concurrently by a bounded thread pool. Every finished
+species is appended to pokemon_data.checkpoint.jsonl, so an interrupted run
+picks up where it stopped; the checkpoint is removed once pokemon_data.json
+has been written. Run build_dataset.py afterwards to refresh the app's dataset.
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pokeapi_client
 
-pokemon_list = []
+OUTPUT_FILE = os.path.join(os.path.dirname(__file__), 'pokemon_data.json')
+CHECKPOINT_FILE = os.path.join(os.path.dirname(__file__), 'pokemon_data.checkpoint.jsonl')
+REQUIRED_FIELDS = ('api_name', 'generation', 'type1', 'type2', 'weight', 'height')
+# Values written by the old parser, which turned 'generation-viii' into int('5111')
+LEGACY_GENERATIONS = {11: 2, 111: 3, 15: 4, 51: 6, 511: 7, 5111: 8, 110: 9}
 
-for species in species_data:
-    species_detail = requests.get(species['url']).json()
-    # Get generation (as a number)
-    gen_str = species_detail['generation']['name']  # e.g. 'generation-i'
-    generation = int(gen_str.split('-')[-1].replace('i','1').replace('v','5').replace('x','10')) if gen_str.startswith('generation-') else None
-    # Get all varieties (forms)
+def fetch_species(species):
+    """All varieties (forms) of one species as pokemon_data.json entries."""
+    species_detail = pokeapi_client.get_json(species['url'])
+    if species_detail is None:
+        raise RuntimeError(f"species {species['name']} could not be fetched")
+    generation = pokeapi_client.generation_number(species_detail['generation']['name'])
+    entries = []
     for variety in species_detail['varieties']:
-        poke_url = variety['pokemon']['url']
-        poke_detail = requests.get(poke_url).json()
-        name = poke_detail['name']
+        poke_detail = pokeapi_client.get_json(variety['pokemon']['url'])
+        if poke_detail is None:
+            raise RuntimeError(f"pokemon {variety['pokemon']['name']} could not be fetched")
         # Types
         types = [t['type']['name'] for t in poke_detail['types']]
         type1 = types[0] if len(types) > 0 else None
         type2 = types[1] if len(types) > 1 else type1
-        # Weight and height
-        weight = poke_detail.get('weight')
-        height = poke_detail.get('height')
-        # Use display name (species name or form name)
-        display_name = poke_detail['name'].replace('-', ' ').title()
-        pokemon_list.append({
-            'name': display_name,
+        entries.append({
+            # Use display name (species name or form name)
+            'name': poke_detail['name'].replace('-', ' ').title(),
             'api_name': poke_detail['name'],
+            'species': species['name'],
             'generation': generation,
             'type1': type1,
             'type2': type2,
-            'weight': weight,
-            'height': height
+            'weight': poke_detail.get('weight'),
+            'height': poke_detail.get('height')
         })
+    return entries
+
+def load_checkpoint():
+    done = {}
+    if not os.path.exists(CHECKPOINT_FILE):
+        return done
+    with open(CHECKPOINT_FILE, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn last line from a crash
+            done[record['species']] = record['entries']
+    return done
+
+def species_of(entry, species_names):
+    # Entries written before the 'species' field existed: exact api_name match,
+    # else the longest species name that prefixes it ('mr-mime-galar' -> 'mr-mime')
+    if entry.get('species'):
+        return entry['species']
+    api_name = entry.get('api_name') or ''
+    if api_name in species_names:
+        return api_name
+    parts = api_name.split('-')
+    for i in range(len(parts) - 1, 0, -1):
+        prefix = '-'.join(parts[:i])
+        if prefix in species_names:
+            return prefix
+    return None
+
+def group_existing(entries, species_names):
+    grouped = {}
+    for entry in entries:
+        entry = dict(entry)
+        entry['generation'] = LEGACY_GENERATIONS.get(entry.get('generation'), entry.get('generation'))
+        species = species_of(entry, species_names)
+        if species:
+            entry['species'] = species
+        grouped.setdefault(species, []).append(entry)
+    return grouped
+
+def is_stale(entries):
+    return not entries or any(entry.get(field) is None for entry in entries for field in REQUIRED_FIELDS)
+
+def write_output(entries):
+    tmp_path = OUTPUT_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, OUTPUT_FILE)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--incremental', action='store_true', help='keep complete species from the existing pokemon_data.json')
+    parser.add_argument('--workers', type=int, default=8, help='concurrent species fetches (default 8)')
+    args = parser.parse_args(argv)
+
+    # Fetch all Pokémon species (for names, forms, and generations)
+    species_list = pokeapi_client.get_json('pokemon-species?limit=10000')['results']
+    species_names = {s['name'] for s in species_list}
+
+    results = load_checkpoint()
+    if results:
+        print(f'Resuming: {len(results)} species already in {os.path.basename(CHECKPOINT_FILE)}')
+    existing = {}
+    if args.incremental and os.path.exists(OUTPUT_FILE):
+        with open(OUTPUT_FILE, encoding='utf-8') as f:
+            existing = group_existing(json.load(f), species_names)
+        for name, entries in existing.items():
+            if name is not None and name not in results and not is_stale(entries):
+                results[name] = entries
+
+    todo = [s for s in species_list if s['name'] not in results]
+    print(f'Fetching {len(todo)} of {len(species_list)} species with {args.workers} workers')
+    failed = []
+    with open(CHECKPOINT_FILE, 'a', encoding='utf-8') as checkpoint, \
+            ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(fetch_species, s): s['name'] for s in todo}
+        for i, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                failed.append(name)
+                print(f'Failed {name}: {e}')
+                continue
+            checkpoint.write(json.dumps({'species': name, 'entries': results[name]}, ensure_ascii=False) + '\n')
+            checkpoint.flush()
+            if i % 50 == 0:
+                print(f'  {i}/{len(todo)} species')
+
+    if failed:
+        print(f'{len(failed)} species failed; re-run to resume from the checkpoint')
+        return 1
 
-with open('pokemon_data.json', 'w', encoding='utf-8') as f:
-    json.dump(pokemon_list, f, ensure_ascii=False, indent=2)
+    # Keep Pokédex order; entries that match no current species are kept at the end
+    pokemon_list = [entry for s in species_list for entry in results[s['name']]]
+    pokemon_list.extend(existing.get(None, []))
+    write_output(pokemon_list)
+    os.remove(CHECKPOINT_FILE)
+    print(f'Saved {len(pokemon_list)} Pokémon entries to {os.path.basename(OUTPUT_FILE)}')
+    return 0
 
-print(f"Saved {len(pokemon_list)} Pokémon entries to pokemon_data.json")
+if __name__ == '__main__':
+    sys.exit(main())
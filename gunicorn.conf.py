@@ -0,0 +1,44 @@
+# Production server config:  gunicorn -c gunicorn.conf.py
+#
+# The app is loaded once in the master (preload_app) through create_app(),
+# which builds every shared index and gc.freeze()s it before the workers are
+# forked, so the dataset lives in pages all workers share instead of one copy
+# each. `python benchmarks/bench_workers.py` measures the difference.
+#
+# Preloading means code changes need a full restart (not a HUP), and anything
+# that must not be shared across a fork (SQLite connections, the comparison
+# table and dataset watcher threads) is opened lazily in each worker.
+#
+# Data changes need neither. A HUP reloads the dataset in the master and then
+# forks fresh workers from it (on_reload below); the old workers finish their
+# requests first. The master also watches the data files (DATASET_WATCH_SECONDS)
+# and sends itself that HUP on a change. Workers do not reload in place: each
+# would build a private copy of every index and lose the shared memory.
+# DATASET_REFRESH_HOURS runs the PokéAPI refresh in the master, once per host.
+import gc
+import os
+import signal
+
+wsgi_app = 'pokemon:create_app()'
+preload_app = True
+bind = os.environ.get('BIND', '0.0.0.0:5002')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2 * (os.cpu_count() or 1) + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+# Recycle workers now and then; a fresh fork starts fully shared again
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+timeout = 30
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')
+
+def on_reload(arbiter):
+    import pokemon
+    if pokemon.reload_dataset():
+        gc.collect()
+        gc.freeze()
+
+def when_ready(server):
+    import pokemon
+    pokemon.start_dataset_watcher(lambda: os.kill(os.getpid(), signal.SIGHUP))
+    # Only the master refreshes from PokéAPI; its watcher then recycles the workers
+    if os.environ.get('DATASET_REFRESH_HOURS'):
+        pokemon.start_background_refresh(float(os.environ['DATASET_REFRESH_HOURS']))
@@ -0,0 +1,129 @@
+"""Remaining-candidate hints: which Pokémon still fit every piece of feedback.
+
+The candidate Pokémon are held column-wise in NumPy arrays (generation, type
+codes, weight, height). The feedback a guess gives against a target is packed
+into one small integer:
+
+    generation lower/same/higher (3) x type1 match (2) x type2 match (2)
+    x weight lighter/same/heavier/unknown (4) x height shorter/same/taller/unknown (4)
+
+so "still possible" means "would have produced the same feedback code for
+every guess so far", one vectorized comparison per guess. Codes of every guess
+against every candidate are computed once into an N x N uint8 matrix (about
+1 MB), after which a hint is a few row lookups.
+
+The matrix uses the dataset's measurements. The few Pokémon it has none for
+get theirs from PokéAPI, as /check_guess does, so their rows and columns are
+recomputed per hint from the values the game is currently answering with.
+
+NumPy is optional; without it the app simply returns no hints.
+"""
+try:
+    import numpy as np
+except ImportError:  # Hints are an extra; the game works without them
+    np = None
+
+FIELDS = ('generation', 'type1', 'type2', 'weight', 'height')
+FEEDBACK_CODES = 3 * 2 * 2 * 4 * 4
+UNKNOWN = 3
+
+def available():
+    return np is not None
+
+def _compare(guess, target):
+    # 0: target is lower, 1: equal, 2: target is higher, UNKNOWN if either is missing
+    code = np.sign(target - guess) + 1
+    return np.where(np.isnan(guess) | np.isnan(target), UNKNOWN, code)
+
+class Columns:
+    """Struct-of-arrays view of a list of Pokémon records; indexing applies to every column."""
+
+    def __init__(self, pokemon_list=(), type_codes=None):
+        self.type_codes = dict(type_codes or {})
+        for p in pokemon_list:
+            for field in ('type1', 'type2'):
+                self.type_codes.setdefault(getattr(p, field) or '', len(self.type_codes))
+        self.generation = np.array([p.generation or 0 for p in pokemon_list], dtype=np.int16)
+        self.type1 = np.array([self.type_codes[p.type1 or ''] for p in pokemon_list], dtype=np.int16)
+        self.type2 = np.array([self.type_codes[p.type2 or ''] for p in pokemon_list], dtype=np.int16)
+        self.weight = np.array([p.weight or np.nan for p in pokemon_list], dtype=np.float64)
+        self.height = np.array([p.height or np.nan for p in pokemon_list], dtype=np.float64)
+
+    def measured(self, rows, measurements):
+        """Copy with weight/height at rows replaced by measurements ({'weight', 'height'} dicts, None for missing)."""
+        view = self[:]
+        view.weight = self.weight.copy()
+        view.height = self.height.copy()
+        for row, stats in zip(rows, measurements):
+            view.weight[row] = stats['weight'] or np.nan
+            view.height[row] = stats['height'] or np.nan
+        return view
+
+    def __len__(self):
+        return len(self.generation)
+
+    def __getitem__(self, index):
+        view = Columns(type_codes=self.type_codes)
+        for field in FIELDS:
+            setattr(view, field, getattr(self, field)[index])
+        return view
+
+def feedback_codes(guesses, targets):
+    """Feedback codes of guesses against targets (two Columns, broadcast like NumPy arrays)."""
+    generation = np.sign(targets.generation - guesses.generation) + 1
+    type1 = (guesses.type1 == targets.type1).astype(np.int16)
+    type2 = (guesses.type2 == targets.type2).astype(np.int16)
+    weight = _compare(guesses.weight, targets.weight)
+    height = _compare(guesses.height, targets.height)
+    return (generation + 3 * (type1 + 2 * (type2 + 2 * (weight + 4 * height)))).astype(np.uint8)
+
+def has_measurements(p):
+    return bool(p.weight and p.height)
+
+class HintEngine:
+    def __init__(self, candidates, measure=None):
+        """candidates: every Pokémon that can be a target, one record per canonical name.
+
+        measure(p) gives {'weight', 'height'} for a Pokémon without dataset
+        measurements, as the guess feedback uses them; without it they stay unknown.
+        """
+        self.candidates = candidates
+        self.measure = measure
+        self.rows = {p.canonical: i for i, p in enumerate(candidates)}
+        self.columns = Columns(candidates)
+        self.unmeasured = np.array([i for i, p in enumerate(candidates) if not has_measurements(p)], dtype=np.intp)
+        # matrix[g, t]: feedback guess g gives when the target is t
+        self.matrix = feedback_codes(self.columns[:, None], self.columns[None, :])
+
+    def remaining(self, guesses, target):
+        """Boolean mask over candidates consistent with the feedback `guesses` got against `target`."""
+        rows = np.array([self.rows[g.canonical] for g in guesses if g.canonical in self.rows], dtype=np.intp)
+        if not len(rows):
+            return np.ones(len(self.candidates), dtype=bool)
+        matrix = self.matrix[rows]
+        columns = self.columns
+        if self.measure is not None and len(self.unmeasured):
+            columns = columns.measured(self.unmeasured, [self.measure(self.candidates[i]) for i in self.unmeasured])
+            # Patch what the dataset-only matrix got wrong: unmeasured targets, then unmeasured guesses
+            matrix[:, self.unmeasured] = feedback_codes(columns[rows][:, None], columns[self.unmeasured][None, :])
+            stale = np.isin(rows, self.unmeasured)
+            if stale.any():
+                matrix[stale] = feedback_codes(columns[rows[stale]][:, None], columns[None, :])
+        target_row = self.rows.get(target.canonical)
+        if target_row is not None and self.candidates[target_row] is target:
+            codes = matrix[:, target_row]
+        else:
+            # A target that is not itself a candidate (e.g. a duplicate dataset row)
+            target_columns = Columns([target], columns.type_codes)
+            if self.measure is not None and not has_measurements(target):
+                target_columns = target_columns.measured([0], [self.measure(target)])
+            codes = feedback_codes(columns[rows], target_columns)
+        return (matrix == codes[:, None]).all(axis=0)
+
+    def hint(self, guesses, target, names=False, limit=50):
+        """{'remaining': count[, 'remaining_names': [...]]} for a hint response."""
+        mask = self.remaining(guesses, target)
+        result = {'remaining': int(mask.sum())}
+        if names:
+            result['remaining_names'] = [self.candidates[i].display for i in np.flatnonzero(mask)[:limit]]
+        return result
@@ -0,0 +1,150 @@
+"""Minimal Prometheus metrics: counters, gauges and histograms in text format.
+
+Only what /metrics needs, without a client library dependency. Metrics are
+per process; under several gunicorn workers each worker reports its own
+values, which Prometheus sums or scrapes per worker as configured.
+
+    REQUESTS = metrics.counter('app_requests_total', 'Requests handled.', ['route'])
+    REQUESTS.labels(route='/').inc()
+    print(metrics.render())
+"""
+import bisect
+import threading
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_registry = []
+_lock = threading.Lock()
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children = {}
+        with _lock:
+            _registry.append(self)
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self.children.get(key)
+        if child is None:
+            with _lock:
+                child = self.children.setdefault(key, self._new_child())
+        return child
+
+    def remove(self, **labels):
+        """Drop one labelled series, e.g. an info gauge's previous version."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with _lock:
+            self.children.pop(key, None)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _unlabelled(self):
+        return self.labels()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for key, child in sorted(self.children.items()):
+            lines.extend(child.render(self.name, self.labelnames, key))
+        return lines
+
+class _Value:
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def set(self, value):
+        self.value = value
+
+    def render(self, name, labelnames, key):
+        return [f'{name}{_labels(labelnames, key)} {_number(self.value)}']
+
+class Counter(_Metric):
+    kind = 'counter'
+    _new_child = _Value
+
+    def inc(self, amount=1):
+        self._unlabelled().inc(amount)
+
+class Gauge(_Metric):
+    kind = 'gauge'
+    _new_child = _Value
+
+    def set(self, value):
+        self._unlabelled().set(value)
+
+class _HistogramValue:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def render(self, name, labelnames, key):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{_labels(labelnames, key, [("le", _number(bound))])} {cumulative}')
+        lines.append(f'{name}_sum{_labels(labelnames, key)} {_number(self.sum)}')
+        lines.append(f'{name}_count{_labels(labelnames, key)} {cumulative}')
+        return lines
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self._unlabelled().observe(value)
+
+def counter(name, documentation, labelnames=()):
+    return Counter(name, documentation, labelnames)
+
+def gauge(name, documentation, labelnames=()):
+    return Gauge(name, documentation, labelnames)
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return Histogram(name, documentation, labelnames, buckets)
+
+def render():
+    """All registered metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in list(_registry):
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,156 @@
+"""Shared HTTP client for PokéAPI (and sprite hosts).
+
+One pooled keep-alive session with bounded retries and timeouts, plus an
+on-disk response cache with a TTL. Stale entries are revalidated with
+If-None-Match / If-Modified-Since instead of being refetched.
+
+Environment overrides:
+    POKEAPI_BASE_URL   API root, e.g. http://127.0.0.1:8765/api/v2 for a local stub
+    POKEAPI_CACHE_DIR  where cached responses are kept (default .pokeapi_cache/)
+    POKEAPI_CACHE_TTL  seconds before a cached response is revalidated (default 7 days)
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = 'https://pokeapi.co/api/v2'
+BASE_URL = os.environ.get('POKEAPI_BASE_URL', DEFAULT_BASE_URL).rstrip('/')
+CACHE_DIR = os.environ.get('POKEAPI_CACHE_DIR', os.path.join(os.path.dirname(__file__), '.pokeapi_cache'))
+CACHE_TTL = int(os.environ.get('POKEAPI_CACHE_TTL', 7 * 24 * 3600))
+TIMEOUT = (3.05, 10)  # (connect, read) seconds
+POOL_SIZE = 16
+# Statuses worth remembering; anything else is retried next time
+CACHEABLE_STATUSES = (200, 404)
+
+ROMAN_GENERATIONS = {'i': 1, 'ii': 2, 'iii': 3, 'iv': 4, 'v': 5, 'vi': 6, 'vii': 7, 'viii': 8, 'ix': 9}
+
+def generation_number(generation_name):
+    """'generation-viii' -> 8; None for anything unrecognised."""
+    if not generation_name or not generation_name.startswith('generation-'):
+        return None
+    roman = generation_name.split('-')[-1].lower()
+    if roman in ROMAN_GENERATIONS:
+        return ROMAN_GENERATIONS[roman]
+    # Generic subtractive parse for generations past IX
+    values = {'i': 1, 'v': 5, 'x': 10}
+    if any(c not in values for c in roman):
+        return None
+    total = 0
+    prev = 0
+    for c in reversed(roman):
+        val = values[c]
+        if val < prev:
+            total -= val
+        else:
+            total += val
+            prev = val
+    return total or None
+
+class CachedResponse:
+    """The subset of requests.Response the call sites use."""
+
+    def __init__(self, status_code, content, from_cache=False):
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.content)
+
+class PokeAPIClient:
+    def __init__(self, base_url=BASE_URL, cache_dir=CACHE_DIR, cache_ttl=CACHE_TTL, timeout=TIMEOUT, retries=3):
+        self.base_url = base_url.rstrip('/')
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=('GET',), respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = 'pokemon-of-the-day'
+
+    def url_for(self, path_or_url):
+        # Relative paths ('pokemon/pikachu') resolve against the base URL. Absolute
+        # PokéAPI URLs (e.g. species links inside responses) follow a base override.
+        if path_or_url.startswith(DEFAULT_BASE_URL):
+            return self.base_url + path_or_url[len(DEFAULT_BASE_URL):]
+        if '://' in path_or_url:
+            return path_or_url
+        return f"{self.base_url}/{path_or_url.lstrip('/')}"
+
+    def _cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _read_cache(self, url):
+        try:
+            with open(self._cache_path(url), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, url, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(url)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def get(self, path_or_url, cache=True):
+        """GET a resource, serving it from the disk cache while fresh."""
+        url = self.url_for(path_or_url)
+        entry = self._read_cache(url) if cache else None
+        if entry and time.time() - entry['fetched_at'] < self.cache_ttl:
+            return CachedResponse(entry['status'], base64.b64decode(entry['body']), from_cache=True)
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        resp = self.session.get(url, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304 and entry:
+            entry['fetched_at'] = time.time()
+            self._write_cache(url, entry)
+            return CachedResponse(entry['status'], base64.b64decode(entry['body']), from_cache=True)
+        if cache and resp.status_code in CACHEABLE_STATUSES:
+            self._write_cache(url, {
+                'url': url,
+                'status': resp.status_code,
+                'fetched_at': time.time(),
+                'etag': resp.headers.get('ETag'),
+                'last_modified': resp.headers.get('Last-Modified'),
+                'body': base64.b64encode(resp.content).decode('ascii'),
+            })
+        return CachedResponse(resp.status_code, resp.content)
+
+    def get_json(self, path_or_url):
+        """Decoded JSON for a 200 response, otherwise None."""
+        resp = self.get(path_or_url)
+        if resp.status_code != 200:
+            return None
+        return resp.json()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PokeAPIClient()
+    return _client
+
+def get(path_or_url, cache=True):
+    return get_client().get(path_or_url, cache=cache)
+
+def get_json(path_or_url):
+    return get_client().get_json(path_or_url)
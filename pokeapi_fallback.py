@@ -0,0 +1,113 @@
+"""Non-blocking PokéAPI lookups for the few Pokémon the dataset has no measurements for.
+
+A request never waits for PokéAPI. lookup() answers from memory, and on a miss
+queues one background fetch per name (concurrent requests for the same name
+share it), so the guess is answered with partial data now and the value is
+there for the next request:
+
+    status, value = fallback.lookup('zygarde-50')
+    # 'hit' (value set), 'pending', 'not_found' or 'circuit_open'
+
+Values are kept for the life of the process; "no such Pokémon" answers are
+kept for POKEAPI_NEGATIVE_TTL seconds (default 1 hour). Errors are not cached,
+but POKEAPI_BREAKER_FAILURES failed or slow (over POKEAPI_SLOW_SECONDS)
+fetches in a row open a circuit breaker: no fetches for
+POKEAPI_BREAKER_RESET seconds, then one trial fetch decides whether it closes.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import metrics
+
+WORKERS = int(os.environ.get('POKEAPI_FALLBACK_WORKERS', 4))
+NEGATIVE_TTL = float(os.environ.get('POKEAPI_NEGATIVE_TTL', 3600))
+SLOW_SECONDS = float(os.environ.get('POKEAPI_SLOW_SECONDS', 2))
+BREAKER_FAILURES = int(os.environ.get('POKEAPI_BREAKER_FAILURES', 5))
+BREAKER_RESET = float(os.environ.get('POKEAPI_BREAKER_RESET', 60))
+
+FETCHES = metrics.counter('pokeapi_fallback_fetches_total', 'Background PokéAPI fetches by outcome.', ['result'])
+CIRCUIT_OPEN = metrics.gauge('pokeapi_circuit_open', '1 while the PokéAPI circuit breaker is open.')
+
+logger = logging.getLogger('pokemon.pokeapi_fallback')
+
+class FallbackFetcher:
+    def __init__(self, fetch, workers=WORKERS, negative_ttl=NEGATIVE_TTL, slow_seconds=SLOW_SECONDS,
+                 breaker_failures=BREAKER_FAILURES, breaker_reset=BREAKER_RESET):
+        """fetch(key) returns the value, None if PokéAPI has none, or raises on errors."""
+        self.fetch = fetch
+        self.workers = workers
+        self.negative_ttl = negative_ttl
+        self.slow_seconds = slow_seconds
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self.results = {}  # key -> (value, expires or None)
+        self.pending = {}  # key -> Future of the in-flight fetch
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def lookup(self, key):
+        """(status, value) without blocking; queues a fetch when nothing is known yet."""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.results.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > now:
+                    return ('hit', value) if value is not None else ('not_found', None)
+                del self.results[key]
+            if key in self.pending:
+                return 'pending', None
+            if not self._allow(now):
+                return 'circuit_open', None
+            if self.executor is None:
+                # Created on first use, i.e. after gunicorn has forked the worker
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='pokeapi-fallback')
+            self.pending[key] = self.executor.submit(self._run, key)
+        return 'pending', None
+
+    def _allow(self, now):
+        if self.opened_at is None:
+            return True
+        if now - self.opened_at >= self.breaker_reset:
+            self.opened_at = now  # Half open: one trial fetch per reset period
+            return True
+        return False
+
+    def _run(self, key):
+        started = time.monotonic()
+        try:
+            value = self.fetch(key)
+            error = False
+        except Exception:
+            logger.warning('PokéAPI fetch for %s failed', key, exc_info=True, extra={'pokemon': key})
+            value = None
+            error = True
+        now = time.monotonic()
+        slow = now - started > self.slow_seconds
+        with self.lock:
+            del self.pending[key]
+            if not error:
+                self.results[key] = (value, None if value is not None else now + self.negative_ttl)
+            if error or slow:
+                self.failures += 1
+                if self.failures >= self.breaker_failures:
+                    if self.opened_at is None:
+                        logger.warning('PokéAPI circuit breaker opened after %d failed or slow fetches', self.failures)
+                    self.opened_at = now
+            else:
+                self.failures = 0
+                self.opened_at = None
+            CIRCUIT_OPEN.set(0 if self.opened_at is None else 1)
+        FETCHES.labels(result='error' if error else 'slow' if slow else 'ok' if value is not None else 'not_found').inc()
+        return value
+
+    def wait(self, timeout=None):
+        """Block until the fetches queued so far have finished (for scripts and benchmarks)."""
+        with self.lock:
+            futures = list(self.pending.values())
+        for future in futures:
+            future.exception(timeout=timeout)
@@ -1,279 +1,241 @@
-from flask import Flask, request, jsonify, render_template
-import csv
+from flask import Flask, request, jsonify, render_template, send_from_directory
+import contextvars
 import datetime
+import gc
+import gzip
 import hashlib
+import re
 import os
-import requests
 import json
-import pokemon_cache_loader
-import uuid
-from flask import session, redirect, url_for
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import custom_game_store
+import game_tokens
+import hints
+import metrics
+import pokeapi_fallback
+import pokemon_dataset
+import suggest
+from pokemon_dataset import canonical_name, display_name
+from flask import g, session, redirect, url_for
+try:
+    import brotli  # Optional: smaller /pokemon_names for browsers that accept br
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
+logger = logging.getLogger('pokemon')
 
-def load_pokemon(csv_path):
-    pokemon = []
-    with open(csv_path, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            try:
-                generation = int(row['gen'])
-            except ValueError:
-                continue  # Skip rows where 'gen' is not an integer
-            name = row['Pokemon'].strip().lower()
-            # Normalize Nidoran names for file/image compatibility
-            if name in ['nidoran♀', 'nidoran♀.', 'nidoran ♀', 'nidoran ♀.']:
-                name = 'nidoranfemale'
-            elif name in ['nidoran♂', 'nidoran♂.', 'nidoran ♂', 'nidoran ♂.']:
-                name = 'nidoranmale'
-            # Try to get weight and height if present in CSV
-            try:
-                weight = float(row.get('Weight', '') or 0)
-            except Exception:
-                weight = None
-            try:
-                height = float(row.get('Height', '') or 0)
-            except Exception:
-                height = None
-            pokemon.append({
-                'name': name,
-                'generation': generation,
-                'type1': row['Type I'].strip().lower(),
-                'type2': row['Type II'].strip().lower() if row['Type II'] else row['Type I'].strip().lower(),
-                'weight': weight,
-                'height': height
-            })
-    return pokemon
-
-CSV_FILE = os.path.join(os.path.dirname(__file__), 'Pokemon Data - National Pokedex.csv')
-POKEMON_LIST = load_pokemon(CSV_FILE)
-
-def roman_to_int(s):
-    # Robust Roman numeral parser for gens up to IX
-    roman_map = {'i': 1, 'ii': 2, 'iii': 3, 'iv': 4, 'v': 5, 'vi': 6, 'vii': 7, 'viii': 8, 'ix': 9}
-    s = s.lower()
-    if s in roman_map:
-        return roman_map[s]
-    # fallback: single char
-    roman_numerals = {'i': 1, 'v': 5, 'x': 10}
-    total = 0
-    prev = 0
-    for c in reversed(s):
-        val = roman_numerals.get(c, 0)
-        if val < prev:
-            total -= val
-        else:
-            total += val
-            prev = val
-    return total if total > 0 else None
-
-# --- Supplement with special forms from PokéAPI if missing ---
-SPECIAL_FORMS = [
-    # Alolan forms (Gen 7)
-    ("Rattata Alola", "rattata-alola"),
-    ("Raticate Alola", "raticate-alola"),
-    ("Raichu Alola", "raichu-alola"),
-    ("Sandshrew Alola", "sandshrew-alola"),
-    ("Sandslash Alola", "sandslash-alola"),
-    ("Vulpix Alola", "vulpix-alola"),
-    ("Ninetales Alola", "ninetales-alola"),
-    ("Diglett Alola", "diglett-alola"),
-    ("Dugtrio Alola", "dugtrio-alola"),
-    ("Meowth Alola", "meowth-alola"),
-    ("Persian Alola", "persian-alola"),
-    ("Geodude Alola", "geodude-alola"),
-    ("Graveler Alola", "graveler-alola"),
-    ("Golem Alola", "golem-alola"),
-    ("Grimer Alola", "grimer-alola"),
-    ("Muk Alola", "muk-alola"),
-    ("Exeggutor Alola", "exeggutor-alola"),
-    ("Marowak Alola", "marowak-alola"),
-    # Galarian forms (Gen 8)
-    ("Meowth Galar", "meowth-galar"),
-    ("Ponyta Galar", "ponyta-galar"),
-    ("Rapidash Galar", "rapidash-galar"),
-    ("Slowpoke Galar", "slowpoke-galar"),
-    ("Slowbro Galar", "slowbro-galar"),
-    ("Farfetch'd Galar", "farfetchd-galar"),
-    ("Weezing Galar", "weezing-galar"),
-    ("Mr. Mime Galar", "mr-mime-galar"),
-    ("Corsola Galar", "corsola-galar"),
-    ("Zigzagoon Galar", "zigzagoon-galar"),
-    ("Linoone Galar", "linoone-galar"),
-    ("Darumaka Galar", "darumaka-galar"),
-    ("Darmanitan Galar Standard", "darmanitan-galar-standard"),
-    ("Yamask Galar", "yamask-galar"),
-    ("Stunfisk Galar", "stunfisk-galar"),
-    ("Articuno Galar", "articuno-galar"),
-    ("Zapdos Galar", "zapdos-galar"),
-    ("Moltres Galar", "moltres-galar"),
-    # Hisuian forms (Gen 8)
-    ("Growlithe Hisui", "growlithe-hisui"),
-    ("Arcanine Hisui", "arcanine-hisui"),
-    ("Voltorb Hisui", "voltorb-hisui"),
-    ("Electrode Hisui", "electrode-hisui"),
-    ("Qwilfish Hisui", "qwilfish-hisui"),
-    ("Sneasel Hisui", "sneasel-hisui"),
-    ("Kleavor", "kleavor"),
-    ("Braviary Hisui", "braviary-hisui"),
-    ("Rufflet Hisui", "rufflet-hisui"),
-    ("Zorua Hisui", "zorua-hisui"),
-    ("Zoroark Hisui", "zoroark-hisui"),
-    ("Basculegion", "basculegion"),
-    ("Basculegion Female", "basculegion-female"),
-    # Paldean forms (Gen 9)
-    ("Tauros Paldea Combat", "tauros-paldea-combat-breed"),
-    ("Tauros Paldea Blaze", "tauros-paldea-blaze-breed"),
-    ("Tauros Paldea Aqua", "tauros-paldea-aqua-breed"),
-    ("Wooper Paldea", "wooper-paldea"),
-    # Lycanroc forms (Gen 7)
-    ("Lycanroc Midday", "lycanroc-midday"),
-    ("Lycanroc Midnight", "lycanroc-midnight"),
-    ("Lycanroc Dusk", "lycanroc-dusk"),
-    # Other forms
-    ("Sneasler", "sneasler"),
-    ("Overqwil", "overqwil"),
-    # Ursaluna forms
-    ("Ursaluna", "ursaluna"),
-    # Removed Ursaluna Bloodmoon and Keldeo forms
-]
-
-SPECIAL_FORMS_CACHE = os.path.join(os.path.dirname(__file__), 'special_forms_cache.json')
-
-def fetch_and_cache_special_forms():
-    cache = []
-    for display, api_name in SPECIAL_FORMS:
-        norm_name = api_name.replace('-', ' ')
-        url = f"https://pokeapi.co/api/v2/pokemon/{api_name}"
-        resp = requests.get(url)
-        if resp.status_code == 200:
-            poke = resp.json()
-            types = [t['type']['name'] for t in poke['types']]
-            weight = poke['weight']
-            height = poke['height']
-            species_url = poke['species']['url']
-            gen = None
-            try:
-                species_resp = requests.get(species_url)
-                if species_resp.status_code == 200:
-                    species_data = species_resp.json()
-                    gen_name = species_data['generation']['name']
-                    if gen_name.startswith('generation-'):
-                        roman = gen_name.split('-')[-1]
-                        gen = roman_to_int(roman)
-                    # Force Paldean forms to Gen 9 (handle both 'paldea' and 'paldean')
-                    if 'paldea' in api_name or 'paldean' in api_name:
-                        gen = 9
-                    if gen == 1:
-                        if 'alola' in api_name:
-                            gen = 7
-                        elif 'galar' in api_name or 'hisui' in api_name:
-                            gen = 8
-                        elif 'paldea' in api_name or 'paldean' in api_name:
-                            gen = 9
-            except Exception:
-                pass
-            type1 = types[0] if len(types) > 0 else ''
-            type2 = types[1] if len(types) > 1 else ''
-            cache.append({
-                'name': norm_name,
-                'generation': gen,
-                'type1': type1,
-                'type2': type2,
-                'types': types,
-                'weight': weight,
-                'height': height,
-                'display': display
-            })
-    with open(SPECIAL_FORMS_CACHE, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
-
-# Only fetch and cache if cache file does not exist or is empty
-if not os.path.exists(SPECIAL_FORMS_CACHE) or os.stat(SPECIAL_FORMS_CACHE).st_size == 0:
-    fetch_and_cache_special_forms()
-
-# Load special forms from cache
-with open(SPECIAL_FORMS_CACHE, 'r', encoding='utf-8') as f:
-    special_forms_data = json.load(f)
-
-def canonical_name(name):
-    n = name.replace('-', ' ').replace('_', ' ').replace('.', '').replace("'", '').lower().strip()
-    # Handle regional forms (prefix or suffix)
-    region_map = {
-        'hisuian': 'hisui',
-        'galarian': 'galar',
-        'alolan': 'alola',
-        'paldean': 'paldea',
-    }
-    for region_prefix, region_suffix in region_map.items():
-        if n.startswith(region_prefix + ' '):
-            # e.g. 'hisuian zoroark' -> 'zoroark hisui'
-            n = n[len(region_prefix):].strip() + ' ' + region_suffix
-        elif n.endswith(' ' + region_suffix):
-            # already in correct form
-            pass
-    n = n.replace(' ', '')
-    return n
-
-existing_names = set()
-for p in POKEMON_LIST:
-    p['canonical'] = canonical_name(p['name'])
-    existing_names.add(p['canonical'])
-for entry in special_forms_data:
-    entry['canonical'] = canonical_name(entry['name'])
-    if entry['canonical'] not in existing_names:
-        POKEMON_LIST.append(entry)
-        existing_names.add(entry['canonical'])
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line; fields passed via extra= become keys."""
+    RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
 
-def get_pokemon_of_the_day(user_timezone_offset):
-    now_utc = datetime.datetime.utcnow()
-    user_midnight = now_utc + datetime.timedelta(hours=user_timezone_offset)
-    user_midnight = user_midnight.replace(hour=0, minute=0, second=0, microsecond=0)
-    seed_str = user_midnight.strftime('%Y-%m-%d')
-    seed = int(hashlib.sha256(seed_str.encode()).hexdigest(), 16)
-    idx = seed % len(POKEMON_LIST)
-    return POKEMON_LIST[idx]
-
-def get_pokemon_api_data(name, form=None):
-    """Fetch weight and height from PokéAPI. Handles regional forms if form is provided."""
-    # Handle Nidoran special cases for PokéAPI
-    if name == 'nidoranfemale':
-        api_name = 'nidoran-f'
-    elif name == 'nidoranmale':
-        api_name = 'nidoran-m'
-    elif name == 'shaymin':
-        api_name = 'shaymin-land'  # PokéAPI expects 'shaymin-land' for base form
+    def format(self, record):
+        entry = {'time': self.formatTime(record), 'level': record.levelname, 'logger': record.name,
+                 'message': record.getMessage()}
+        entry.update({k: v for k, v in vars(record).items() if k not in self.RESERVED})
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def configure_logging():
+    # LOG_LEVEL (default INFO), LOG_FORMAT=json for structured output; an
+    # already configured root logger (e.g. by a test runner) is left alone
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    handler = logging.StreamHandler()
+    if os.environ.get('LOG_FORMAT') == 'json':
+        handler.setFormatter(JsonLogFormatter())
     else:
-        # Normalize: replace spaces with dashes, remove dots/apostrophes, lowercase
-        api_name = name.replace(' ', '-').replace('.', '').replace("'", "").lower()
-    if form:
-        api_name = f"{api_name}-{form}"
-    url = f"https://pokeapi.co/api/v2/pokemon/{api_name}"
-    print('Fetching URL:', url)
-    print(f'Calling PokéAPI for: {api_name}')
-    resp = requests.get(url)
-    print(f'PokéAPI status for {api_name}:', resp.status_code)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    root.addHandler(handler)
+    root.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+
+configure_logging()
+
+REQUEST_LATENCY = metrics.histogram('http_request_duration_seconds', 'Request latency by route.', ['route', 'method'])
+REQUESTS = metrics.counter('http_requests_total', 'Requests by route and status.', ['route', 'method', 'status'])
+MEASUREMENT_SOURCES = metrics.counter('weight_height_lookups_total',
+                                      'Answered guesses by where their weight/height came from: dataset or pokeapi, else pending, not_found or circuit_open.', ['source'])
+CUSTOM_GAME_CODE_EVENTS = metrics.counter('custom_game_codes_total', 'Custom game codes issued and resolved.',
+                                          ['kind', 'operation', 'result'])
+DATASET_INFO = metrics.gauge('dataset_info', 'Version of the loaded dataset.', ['hash', 'format'])
+DATASET_RELOADS = metrics.counter('dataset_reloads_total', 'Dataset reloads: reloaded, unchanged or error.', ['result'])
+
+# The dataset and every index built from it live in one Snapshot (see
+# current_snapshot() below), which reload_dataset() replaces as a whole
+
+def build_pokemon_index(pokemon_list):
+    """Index pokemon_list by canonical name.
+
+    Returns (preferred, forms): canonical -> preferred entry (highest
+    generation, first wins on ties) and canonical -> every entry with that name.
+    """
+    forms = {}
+    for p in pokemon_list:
+        forms.setdefault(p.canonical, []).append(p)
+    preferred = {}
+    for canon, entries in forms.items():
+        preferred[canon] = max(entries, key=lambda p: p.generation or 0)
+    return preferred, forms
+
+def find_pokemon(name):
+    """Return the preferred dataset entry for any spelling of name, or None."""
+    return current_snapshot().index.get(canonical_name(name))
+
+# Daily targets are precomputed for a window around today; archive mode can
+# replay any day in the past part of that window
+CALENDAR_PAST_DAYS = pokemon_dataset.CALENDAR_PAST_DAYS
+CALENDAR_FUTURE_DAYS = int(os.environ.get('DAILY_CALENDAR_FUTURE_DAYS', 30))
+daily_index = pokemon_dataset.daily_index
+
+def build_daily_calendar(center, past_days, future_days, count):
+    """date -> dataset row for every day in [center - past_days, center + future_days]."""
+    start = center - datetime.timedelta(days=past_days)
+    days = (start + datetime.timedelta(days=i) for i in range(past_days + future_days + 1))
+    return {day: daily_index(day, count) for day in days}
+
+def recorded_calendar(snapshot):
+    """The picks the dataset records for started days (see build_dataset.carry_calendar), as rows of snapshot.
+
+    Picks whose Pokémon left the dataset are left to the seed.
+    """
+    calendar = {}
+    for day, name in snapshot.dataset.get('calendar', {}).items():
+        canonical = canonical_name(name)
+        forms = snapshot.forms.get(canonical)
+        if forms:
+            p = next((p for p in forms if p.name == name), snapshot.index[canonical])
+            calendar[datetime.date.fromisoformat(day)] = snapshot.rows[id(p)]
+    return calendar
+
+def parse_timezone_offset(value):
+    # Hours east of UTC; fractional offsets such as 5.5 or 5.75 are valid
+    try:
+        offset = float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return offset if -14 <= offset <= 14 else 0.0
+
+def local_date(user_timezone_offset):
+    now_utc = datetime.datetime.now(datetime.timezone.utc)
+    return (now_utc + datetime.timedelta(hours=parse_timezone_offset(user_timezone_offset))).date()
+
+def resolve_puzzle_date(requested, user_timezone_offset):
+    """The player's local today, or a past day from the archive. Raises ValueError."""
+    today = local_date(user_timezone_offset)
+    if not requested:
+        return today
+    try:
+        day = datetime.date.fromisoformat(requested)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid date, expected YYYY-MM-DD.')
+    if day > today:
+        raise ValueError('That puzzle is not available yet.')
+    if day < today - datetime.timedelta(days=CALENDAR_PAST_DAYS):
+        raise ValueError('That day is not in the archive.')
+    return day
+
+def get_pokemon_for_date(day, snapshot=None):
+    snapshot = snapshot or current_snapshot()
+    idx = snapshot.calendar.get(day)
+    if idx is None:
+        # The window slides as the server keeps running; memoize the new day
+        idx = snapshot.calendar[day] = daily_index(day, len(snapshot.pokemon_list))
+    return snapshot.pokemon_list[idx]
+
+def get_pokemon_of_the_day(user_timezone_offset):
+    return get_pokemon_for_date(local_date(user_timezone_offset))
+
+def get_pokemon_api_data(api_name):
+    """Fetch weight and height from PokéAPI for a record's api_name."""
+    # Imported on first use: only this fallback needs requests, so startup stays lean
+    import pokeapi_client
+    url = pokeapi_client.get_client().url_for(f'pokemon/{api_name}')
+    resp = pokeapi_client.get(url)
+    logger.debug('PokéAPI %s -> %s', api_name, resp.status_code,
+                 extra={'api_name': api_name, 'status': resp.status_code, 'from_cache': getattr(resp, 'from_cache', False)})
     if resp.status_code == 200:
         data = resp.json()
-        print(f'PokéAPI data for {api_name}:', {'weight': data['weight'], 'height': data['height']})
         return {
             'weight': data['weight'],
             'height': data['height']
         }
-    print('API 404 for:', url)
+    if resp.status_code == 404:
+        logger.info('PokéAPI has no entry for %s', api_name, extra={'url': url, 'status': resp.status_code})
+        return None
+    raise OSError(f'PokéAPI returned {resp.status_code} for {api_name}')
+
+def fetch_measurements(api_name):
+    """Weight (kg) and height (m) from PokéAPI, None if it has none; raises on errors."""
+    api = get_pokemon_api_data(api_name)
+    if api and api['weight'] not in (None, 0, '') and api['height'] not in (None, 0, ''):
+        logger.info('Measurements for %s came from PokéAPI', api_name, extra={'pokemon': api_name})
+        return {
+            'weight': api['weight'] / 10.0,
+            'height': api['height'] / 10.0
+        }
     return None
 
-# In-memory mapping for demo; for production, use a persistent store
-CUSTOM_GAME_FILE = os.path.join(os.path.dirname(__file__), 'custom_games.json')
-if os.path.exists(CUSTOM_GAME_FILE):
-    with open(CUSTOM_GAME_FILE, 'r') as f:
-        custom_games = json.load(f)
-else:
-    custom_games = {}
+# PokéAPI is only asked in the background; see pokeapi_fallback.py
+measurement_fallback = pokeapi_fallback.FallbackFetcher(fetch_measurements)
+
+# Custom game codes live in a store shared by all workers (see custom_game_store.py)
+custom_games = custom_game_store.open_store()
+
+# New codes are self-contained tokens any worker can read (game_tokens.py);
+# CUSTOM_GAME_CODES=store keeps issuing 12-hex codes from the store instead
+CUSTOM_GAME_CODES = os.environ.get('CUSTOM_GAME_CODES', 'token')
+LEGACY_CODE = re.compile(r'[0-9a-f]{12}')
+
+def create_custom_game_code(norm):
+    if CUSTOM_GAME_CODES == 'store':
+        code = custom_games.create(norm)
+    else:
+        snapshot = current_snapshot()
+        code = game_tokens.issue(snapshot.rows[id(snapshot.index[norm])], norm, custom_game_store.DEFAULT_TTL)
+    CUSTOM_GAME_CODE_EVENTS.labels(kind=CUSTOM_GAME_CODES, operation='issue', result='ok').inc()
+    return code
+
+def resolve_custom_game(code):
+    """Target Pokémon for a token or legacy store code, or None if invalid or expired."""
+    if not code:
+        return None
+    snapshot = current_snapshot()
+    if LEGACY_CODE.fullmatch(code):
+        norm = custom_games.get(code)
+        target = snapshot.index.get(norm) if norm else None
+        CUSTOM_GAME_CODE_EVENTS.labels(kind='store', operation='resolve', result='ok' if target else 'unknown').inc()
+        return target
+    decoded = game_tokens.read(code)
+    if decoded is None:
+        CUSTOM_GAME_CODE_EVENTS.labels(kind='token', operation='resolve', result='invalid').inc()
+        return None
+    index, check, version = decoded
+    if index < len(snapshot.pokemon_list) and game_tokens.name_check(snapshot.pokemon_list[index].canonical, version) == check:
+        CUSTOM_GAME_CODE_EVENTS.labels(kind='token', operation='resolve', result='ok').inc()
+        return snapshot.index[snapshot.pokemon_list[index].canonical]
+    # The dataset was rebuilt since the token was issued; match the name check instead
+    canonical = get_token_names(version, snapshot).get(check)
+    CUSTOM_GAME_CODE_EVENTS.labels(kind='token', operation='resolve', result='remapped' if canonical else 'unknown').inc()
+    return snapshot.index[canonical] if canonical else None
 
-def save_custom_games():
-    with open(CUSTOM_GAME_FILE, 'w') as f:
-        json.dump(custom_games, f)
+def get_token_names(version, snapshot=None):
+    """{name check: canonical name} for tokens of a version; None where several names share a check."""
+    snapshot = snapshot or current_snapshot()
+    names = snapshot.token_names.get(version)
+    if names is None:
+        names = {}
+        for canonical in {p.canonical for p in snapshot.pokemon_list}:
+            check = game_tokens.name_check(canonical, version)
+            # A version 1 check is only 16 bits: never guess between colliding names
+            names[check] = None if check in names else canonical
+        snapshot.token_names[version] = names
+    return names
 
 @app.route('/custom_game', methods=['POST'])
 def create_custom_game():
@@ -283,13 +245,9 @@ def create_custom_game():
         return jsonify({'error': 'Missing Pokémon name'}), 400
     # Find canonical name
     norm = canonical_name(pokemon_name)
-    matches = [p for p in POKEMON_LIST if p.get('canonical', canonical_name(p['name'])) == norm]
-    if not matches:
+    if norm not in current_snapshot().index:
         return jsonify({'error': 'Pokémon not found'}), 404
-    # Generate unique code
-    code = uuid.uuid4().hex[:12]
-    custom_games[code] = norm
-    save_custom_games()
+    code = create_custom_game_code(norm)
     # Return the secret link
     link = url_for('home', game=code, _external=True)
     return jsonify({'link': link, 'code': code})
@@ -301,12 +259,7 @@ def get_custom_game_pokemon():
     code = request.args.get('game')
     if not code and request.is_json:
         code = request.json.get('game')
-    if code and code in custom_games:
-        norm = custom_games[code]
-        matches = [p for p in POKEMON_LIST if p.get('canonical', canonical_name(p['name'])) == norm]
-        if matches:
-            return max(matches, key=lambda p: p.get('generation', 0))
-    return None
+    return resolve_custom_game(code)
 
 @app.route('/')
 def home():
@@ -315,376 +268,367 @@ def home():
     if custom_name:
         # Call the create_custom_game logic directly (not via HTTP)
         norm = canonical_name(custom_name)
-        matches = [p for p in POKEMON_LIST if p.get('canonical', canonical_name(p['name'])) == norm]
-        if not matches:
+        if norm not in current_snapshot().index:
             # Optionally, you could show an error page here
             return redirect(url_for('home'))
-        # Generate unique code
-        code = uuid.uuid4().hex[:12]
-        custom_games[code] = norm
-        save_custom_games()
+        code = create_custom_game_code(norm)
         # Redirect to the secret game link
         return redirect(url_for('home', game=code))
     # Optionally, you can pass the custom game info to the template if needed
-    return render_template('home.html')
+    # Without a built store the page asks PokéAPI directly instead of a request that can only 404
+    return render_template('home.html', names_version=current_snapshot().names_etag,
+                           pokedex_store=get_pokedex_entries()[1] is not None)
 
-@app.route('/check_guess', methods=['POST'])
-def check_guess():
-    data = request.json
-    guess_name = data.get('guess')
-    timezone_offset = data.get('timezone_offset', 0)
-    def normalize(name):
-        n = name.replace('-', '').replace(' ', '').replace('_', '').replace('.', '').replace("'", '').lower()
-        # Special cases for defaulting to canonical/gendered/standard forms
-        if n == 'maushold':
-            return 'mausholdfamilyofthree'
-        if n == 'indeedee':
-            return 'indeedeemale'
-        if n == 'meowstic':
-            return 'meowsticmale'
-        if n == 'frillish':
-            return 'frillishmale'
-        if n == 'jellicent':
-            return 'jellicentmale'
-        if n == 'pyroar':
-            return 'pyroarmale'
-        if n == 'unfezant':
-            return 'unfezantmale'
-        if n == 'hippopotas':
-            return 'hippopotasfemale'  # Hippopotas default is female (matches sprite convention)
-        if n == 'hippowdon':
-            return 'hippowdonfemale'
-        if n == 'basculin':
-            return 'basculinredstriped'
-        if n == 'basculegion':
-            return 'basculegionmale'
-        if n == 'oricorio':
-            return 'oricoriobaile'
-        if n == 'lycanroc':
-            return 'lycanrocmidday'
-        if n == 'toxtricity':
-            return 'toxtricityamped'
-        if n in ['flabébé', 'flabebe']:
-            return 'flabebe'
-        return n
-    norm_guess = canonical_name(guess_name)
-    # Use canonical for all matching in check_guess
-    matches = [p for p in POKEMON_LIST if p.get('canonical', canonical_name(p['name'])) == norm_guess]
-    guess = max(matches, key=lambda p: p.get('generation', 0)) if matches else None
-    # Use custom game Pokémon if present
+def lookup_weight_height(p):
+    """Weight (kg) and height (m) of a Pokémon and where they came from.
+
+    Returns ({'weight', 'height'}, source); source is dataset or pokeapi, else
+    pending, not_found or circuit_open with both values None.
+    """
+    # 1. Measurements resolved from the cache at build time (already kg/m)
+    if p.weight and p.height:
+        return {'weight': p.weight, 'height': p.height}, 'dataset'
+    # 2. PokéAPI, fetched in the background: until it answers the guess gets no
+    # weight/height, and the next request for this Pokémon has them
+    status, measurements = measurement_fallback.lookup(p.api_name)
+    if measurements is not None:
+        return measurements, 'pokeapi'
+    logger.debug('No weight/height for %s (%s)', p.name, status, extra={'pokemon': p.name, 'status': status})
+    return {'weight': None, 'height': None}, status
+
+def get_weight_height(p):
+    """Weight (kg) and height (m) of a Pokémon, from the dataset or, failing that, PokéAPI."""
+    return lookup_weight_height(p)[0]
+
+def resolve_target(data):
+    """Target of the game described by a guess request: custom game, else the (archive) day.
+
+    Raises ValueError for an invalid puzzle date.
+    """
     custom_pokemon = get_custom_game_pokemon()
     if custom_pokemon:
-        target = custom_pokemon
-    else:
-        target = get_pokemon_of_the_day(timezone_offset)
-    if not guess:
-        return jsonify({'error': 'Pokemon not found.'}), 404
+        return custom_pokemon
+    return get_pokemon_for_date(resolve_puzzle_date(data.get('date'), data.get('timezone_offset', 0)))
 
-    def get_weight_height(p):
-            # Helper function to normalize names for cache lookup
-            def normalize(name):
-                n = name.replace('-', '').replace(' ', '').replace('_', '').replace('.', '').replace("'", '').lower()
-                # Special cases for defaulting to canonical/gendered/standard forms
-                if n == 'maushold':
-                    return 'mausholdfamilyofthree'
-                if n == 'indeedee':
-                    return 'indeedeemale'
-                if n == 'meowstic':
-                    return 'meowsticmale'
-                if n == 'frillish':
-                    return 'frillishmale'
-                if n == 'jellicent':
-                    return 'jellicentmale'
-                if n == 'pyroar':
-                    return 'pyroarmale'
-                if n == 'unfezant':
-                    return 'unfezantmale'
-                if n == 'hippopotas':
-                    return 'hippopotasfemale'  # Hippopotas default is female (matches sprite convention)
-                if n == 'hippowdon':
-                    return 'hippowdonfemale'
-                if n == 'basculin':
-                    return 'basculinredstriped'
-                if n == 'basculegion':
-                    return 'basculegionmale'
-                if n == 'oricorio':
-                    return 'oricoriobaile'
-                if n == 'lycanroc':
-                    return 'lycanrocmidday'
-                if n == 'toxtricity':
-                    return 'toxtricityamped'
-                if n in ['flabébé', 'flabebe']:
-                    return 'flabebe'
-                if n.startswith('keldeo'):
-                    return 'keldeoordinary'  # Always use ordinary form for any Keldeo guess
-                return n
-            print(f"[DEBUG] Looking up weight/height for: {p['name']}")
-            # 1. Try cache
-            norm_name = normalize(p['name'])
-            # Special handling for Keldeo: always use 'keldeo' for cache/API
-            if norm_name == 'keldeo':
-                cache_entry = pokemon_cache_loader.find_pokemon_cache_entry('keldeo')
-            else:
-                cache_entry = pokemon_cache_loader.find_pokemon_cache_entry(norm_name)
-            if cache_entry:
-                print(f"[DEBUG] Found in cache for '{norm_name}': weight={cache_entry.get('weight')}, height={cache_entry.get('height')}")
-            # Variant lookups for special cases
-            special_cases = {
-                'mausholdfamilyofthree': [
-                    'maushold family of three', 'maushold familyofthree', 'maushold family-of-three', 'maushold-family-of-three', 'Maushold Family Of Three'
-                ],
-                'indeedeemale': [
-                    'indeedee male', 'indeedeemale', 'indeedee-male', 'indeedee_male', 'Indeedee Male', 'INDEEDEE MALE'
-                ],
-                'indeedeefemale': [
-                    'indeedee female', 'indeedeefemale', 'indeedee-female', 'indeedee_female', 'Indeedee Female', 'INDEEDEE FEMALE'
-                ],
-                'meowsticmale': [
-                    'meowstic male', 'meowsticmale', 'meowstic-male', 'meowstic_male', 'Meowstic Male', 'MEOWSTIC MALE'
-                ],
-                'meowsticfemale': [
-                    'meowstic female', 'meowsticfemale', 'meowstic-female', 'meowstic_female', 'Meowstic Female', 'MEOWSTIC FEMALE'
-                ],
-                'frillishmale': [
-                    'frillish male', 'frillishmale', 'frillish-male', 'frillish_male', 'Frillish Male', 'FRILLISH MALE'
-                ],
-                'frillishfemale': [
-                    'frillish female', 'frillishfemale', 'frillish-female', 'frillish_female', 'Frillish Female', 'FRILLISH FEMALE'
-                ],
-                'jellicentmale': [
-                    'jellicent male', 'jellicentmale', 'jellicent-male', 'jellicent_male', 'Jellicent Male', 'JELLICENT MALE'
-                ],
-                'jellicentfemale': [
-                    'jellicent female', 'jellicentfemale', 'jellicent-female', 'jellicent_female', 'Jellicent Female', 'JELLICENT FEMALE'
-                ],
-                'pyroarmale': [
-                    'pyroar male', 'pyroarmale', 'pyroar-male', 'pyroar_male', 'Pyroar Male', 'PYROAR MALE'
-                ],
-                'pyroarfemale': [
-                    'pyroar female', 'pyroarfemale', 'pyroar-female', 'pyroar_female', 'Pyroar Female', 'PYROAR FEMALE'
-                ],
-                'unfezantmale': [
-                    'unfezant male', 'unfezantmale', 'unfezant-male', 'unfezant_male', 'Unfezant Male', 'UNFEZANT MALE'
-                ],
-                'unfezantfemale': [
-                    'unfezant female', 'unfezantfemale', 'unfezant-female', 'unfezant_female', 'Unfezant Female', 'UNFEZANT FEMALE'
-                ],
-                'hippopotasfemale': [
-                    'hippopotas female', 'hippopotasfemale', 'hippopotas-female', 'hippopotas_female', 'Hippopotas Female', 'HIPPOPOTAS FEMALE'
-                ],
-                'hippowdonfemale': [
-                    'hippowdon female', 'hippowdonfemale', 'hippowdon-female', 'hippowdon_female', 'Hippowdon Female', 'HIPPOWDON FEMALE'
-                ],
-                'basculinredstriped': [
-                    'basculin red striped', 'basculinredstriped', 'basculin-red-striped', 'basculin_red_striped', 'Basculin Red Striped', 'BASCULIN RED STRIPED'
-                ],
-                'basculegionmale': [
-                    'basculegion male', 'basculegionmale', 'basculegion-male', 'basculegion_male', 'Basculegion Male', 'BASCULEGION MALE'
-                ],
-                'basculegionfemale': [
-                    'basculegion female', 'basculegionfemale', 'basculegion-female', 'basculegion_female', 'Basculegion Female', 'BASCULEGION FEMALE'
-                ],
-                'oricoriobaile': [
-                    'oricorio baile', 'oricoriobaile', 'oricorio-baile', 'oricorio_baile', 'Oricorio Baile', 'ORICORIO BAILE'
-                ],
-                'lycanrocmidday': [
-                    'lycanroc midday', 'lycanrocmidday', 'lycanroc-midday', 'lycanroc_midday', 'Lycanroc Midday', 'LYCANROC MIDDAY'
-                ],
-                'lycanrocmidnight': [
-                    'lycanroc midnight', 'lycanrocmidnight', 'lycanroc-midnight', 'lycanroc_midnight', 'Lycanroc Midnight', 'LYCANROC MIDNIGHT'
-                ],
-                'lycanrocdusk': [
-                    'lycanroc dusk', 'lycanrocdusk', 'lycanroc-dusk', 'lycanroc_dusk', 'Lycanroc Dusk', 'LYCANROC DUSK'
-                ],
-                'toxtricityamped': [
-                    'toxtricity amped', 'toxtricityamped', 'toxtricity-amped', 'toxtricity_amped', 'Toxtricity Amped', 'TOXTRICITY AMPED'
-                ],
-                'toxtricitylowkey': [
-                    'toxtricity low key', 'toxtricitylowkey', 'toxtricity-low-key', 'toxtricity_low_key', 'Toxtricity Low Key', 'TOXTRICITY LOW KEY'
-                ]
-            }
-            if not cache_entry and norm_name in special_cases:
-                for v in special_cases[norm_name]:
-                    cache_entry = pokemon_cache_loader.find_pokemon_cache_entry(v)
-                    if cache_entry:
-                        print(f"[DEBUG] Found in cache for special case '{v}': weight={cache_entry.get('weight')}, height={cache_entry.get('height')}")
-                        break
-            if cache_entry and 'weight' in cache_entry and 'height' in cache_entry:
-                if cache_entry['weight'] not in (None, 0, '') and cache_entry['height'] not in (None, 0, ''):
-                    # Convert to kg/m if needed (PokéAPI and cache are in decagrams/dm)
-                    return {
-                        'weight': cache_entry['weight'] / 10.0,
-                        'height': cache_entry['height'] / 10.0
-                    }
-                else:
-                    print(f"[DEBUG] Cache entry found but weight/height missing or zero for '{norm_name}'")
-            # 2. Try PokéAPI as fallback
-            try:
-                # Special handling for Keldeo: always use 'keldeo' for API
-                api_name = p['name']
-                if norm_name == 'keldeo':
-                    api_name = 'keldeo'
-                api = get_pokemon_api_data(api_name, p.get('form'))
-                if api and api['weight'] not in (None, 0, '') and api['height'] not in (None, 0, ''):
-                    print(f"[DEBUG] Found in PokéAPI: weight={api['weight']}, height={api['height']}")
-                    return {
-                        'weight': api['weight'] / 10.0,
-                        'height': api['height'] / 10.0
-                    }
-                else:
-                    print(f"[DEBUG] PokéAPI call failed or returned missing/zero for '{p['name']}'")
-            except Exception as e:
-                print(f"[DEBUG] PokéAPI exception for '{p['name']}': {e}")
-            print(f"[DEBUG] All sources failed for '{p['name']}' - returning None")
-            return {'weight': None, 'height': None}
-
-    guess_stats = get_weight_height(guess)
-    target_stats = get_weight_height(target)
-    print(f"[DEBUG] Target Pokémon raw: {target}")
-    print(f"[DEBUG] Target Pokémon name: {target.get('name')}")
-    print(f"[DEBUG] Target Pokémon normalized: {normalize(target.get('name'))}")
-    target_stats = get_weight_height(target)
-    print(f"[DEBUG] target_stats after get_weight_height: {target_stats}")
+def evaluate_guess(guess, target, target_stats, guess_stats=None):
+    """/check_guess result for one guess against a target whose measurements are known."""
+    if guess_stats is None:
+        guess_stats = get_weight_height(guess)
     heavier = lighter = None
-    weight = height = target_weight = target_height = None
     if guess_stats['weight'] is not None and target_stats['weight'] is not None:
         heavier = guess_stats['weight'] > target_stats['weight']
         lighter = guess_stats['weight'] < target_stats['weight']
-    weight = guess_stats['weight']
-    height = guess_stats['height']
-    target_weight = target_stats['weight']
-    target_height = target_stats['height']
 
     # Always return 'flabebe' (no accent) as the canonical name for API responses
-    response_name = guess['name']
+    response_name = guess.name
     # Special case: show 'Basculegion' for basculegionfemale
-    if normalize(guess['name']) == 'flabebe':
+    if guess.normalized in ('flabebe', 'flabébé'):
         response_name = 'flabebe'
-    elif normalize(guess['name']) == 'basculegionfemale':
+    elif guess.normalized == 'basculegionfemale':
         response_name = 'Basculegion'
-    result = {
+    return {
         'name': response_name,
-        'generation': guess.get('generation') == target.get('generation'),
-        'generation_number': guess.get('generation'),
-        'target_generation_number': target.get('generation'),
-        'type1': guess.get('type1') == target.get('type1'),
-        'type2': guess.get('type2') == target.get('type2'),
-        'type1_name': guess.get('type1'),
-        'type2_name': guess.get('type2') if guess.get('type2') != guess.get('type1') else '',
+        'generation': guess.generation == target.generation,
+        'generation_number': guess.generation,
+        'target_generation_number': target.generation,
+        'type1': guess.type1 == target.type1,
+        'type2': guess.type2 == target.type2,
+        'type1_name': guess.type1,
+        'type2_name': guess.type2 if guess.type2 != guess.type1 else '',
         'heavier': heavier,
         'lighter': lighter,
-        'weight': weight,
-        'height': height,
-        'target_weight': target_weight,
-        'target_height': target_height,
+        'weight': guess_stats['weight'],
+        'height': guess_stats['height'],
+        'target_weight': target_stats['weight'],
+        'target_height': target_stats['height'],
         # Add target Pokémon details for frontend modal
-        'target_name': target.get('name'),
-        'target_type1': target.get('type1'),
-        'target_type2': target.get('type2'),
-        'target_generation': target.get('generation')
+        'target_name': target.name,
+        'target_type1': target.type1,
+        'target_type2': target.type2,
+        'target_generation': target.generation
     }
-    print('DEBUG: guess_stats', guess_stats)
-    print('DEBUG: target_stats', target_stats)
-    print('DEBUG: result', result)
+
+# Longest board /check_guesses (or a hint's previous_guesses) may carry
+MAX_BATCH_GUESSES = 100
+
+def get_hint_engine(snapshot=None):
+    """Hint engine over the snapshot's hint candidates, built on first use; None without NumPy."""
+    snapshot = snapshot or current_snapshot()
+    if snapshot.hint_engine is None and hints.available():
+        # Same measurements as the guess feedback, including those PokéAPI filled in
+        snapshot.hint_engine = hints.HintEngine(snapshot.hint_candidates, get_weight_height)
+    return snapshot.hint_engine
+
+# Precomputed results of every possible guess against recent targets, so a guess
+# is one dict lookup. Tables are built in a background thread on first use and
+# for the days that are current somewhere in the world; each takes ~1-2 MB.
+COMPARISON_TABLE_SLOTS = int(os.environ.get('COMPARISON_TABLE_SLOTS', 16))
+COMPARISON_TABLE_LOOKUPS = metrics.counter('comparison_table_lookups_total',
+                                           'Guesses answered from a comparison table (hit) or evaluated (miss).',
+                                           ['result'])
+COMPARISON_TABLE_HITS = COMPARISON_TABLE_LOOKUPS.labels(result='hit')
+COMPARISON_TABLE_MISSES = COMPARISON_TABLE_LOOKUPS.labels(result='miss')
+_comparison_lock = threading.Lock()
+_comparison_executor = None
+
+def has_measurements(p):
+    return bool(p.weight and p.height)
+
+def build_comparison_table(snapshot, target):
+    """{guess row: evaluate_guess result} for every candidate with dataset measurements.
+
+    Guesses whose measurements would need PokéAPI are left out and evaluated per
+    request, so building a table never touches the network.
+    """
+    target_stats = {'weight': target.weight, 'height': target.height}
+    return {snapshot.rows[id(guess)]: evaluate_guess(guess, target, target_stats,
+                                                    {'weight': guess.weight, 'height': guess.height})
+            for guess in snapshot.hint_candidates if has_measurements(guess)}
+
+def _store_comparison_table(snapshot, row):
+    try:
+        table = build_comparison_table(snapshot, snapshot.pokemon_list[row])
+    except Exception:
+        logger.exception('Building the comparison table for %s failed', snapshot.pokemon_list[row].name)
+        table = None
+    with _comparison_lock:
+        snapshot.comparison_pending.discard(row)
+        if table is not None:
+            snapshot.comparison_tables[row] = table
+            while len(snapshot.comparison_tables) > COMPARISON_TABLE_SLOTS:
+                snapshot.comparison_tables.popitem(last=False)
+
+def schedule_comparison_table(snapshot, target):
+    """Queue a background build of target's table unless it exists or can't be built."""
+    global _comparison_executor
+    row = snapshot.rows.get(id(target))
+    if row is None or not has_measurements(target) or COMPARISON_TABLE_SLOTS <= 0:
+        return
+    with _comparison_lock:
+        if row in snapshot.comparison_tables or row in snapshot.comparison_pending:
+            return
+        snapshot.comparison_pending.add(row)
+        if _comparison_executor is None:
+            # Created on first use, i.e. after gunicorn has forked the worker
+            _comparison_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='comparison-tables')
+    _comparison_executor.submit(_store_comparison_table, snapshot, row)
+
+def daily_targets(today, snapshot=None):
+    """Targets players can be on somewhere between UTC-12 and UTC+14: today, tomorrow and yesterday."""
+    return [get_pokemon_for_date(today + datetime.timedelta(days=days), snapshot) for days in (0, 1, -1)]
+
+def warm_daily_tables():
+    """Once per UTC day, queue tables for the daily targets."""
+    snapshot = current_snapshot()
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    if today == snapshot.warmed_day:
+        return
+    snapshot.warmed_day = today
+    for target in daily_targets(today, snapshot):
+        schedule_comparison_table(snapshot, target)
+
+def compare_guess(guess, target, target_lookup=None):
+    """evaluate_guess result, from the target's comparison table when it is ready.
+
+    target_lookup is lookup_weight_height(target), if the caller already has it.
+    Every answered guess counts once in weight_height_lookups_total. Results
+    from a table are shared between requests; copy before changing them.
+    """
+    snapshot = current_snapshot()
+    row = snapshot.rows.get(id(target))
+    with _comparison_lock:
+        table = snapshot.comparison_tables.get(row)
+        if table is not None:
+            snapshot.comparison_tables.move_to_end(row)
+    result = table.get(snapshot.rows.get(id(guess))) if table is not None else None
+    if result is not None:
+        COMPARISON_TABLE_HITS.inc()
+        # Tables only hold guesses and targets whose measurements are in the dataset
+        MEASUREMENT_SOURCES.labels(source='dataset').inc()
+        return result
+    if table is None:
+        schedule_comparison_table(snapshot, target)
+    COMPARISON_TABLE_MISSES.inc()
+    target_stats, target_source = target_lookup or lookup_weight_height(target)
+    guess_stats, source = lookup_weight_height(guess)
+    # The answer counts under its guess's source, or its target's if the guess came from the dataset
+    MEASUREMENT_SOURCES.labels(source=target_source if source == 'dataset' else source).inc()
+    return evaluate_guess(guess, target, target_stats, guess_stats)
+
+@app.route('/check_guess', methods=['POST'])
+def check_guess():
+    data = request.json
+    warm_daily_tables()
+    guess = find_pokemon(data.get('guess'))
+    try:
+        target = resolve_target(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not guess:
+        return jsonify({'error': 'Pokemon not found.'}), 404
+    result = compare_guess(guess, target)
+    # Optional hint: how many Pokémon still fit this and the earlier guesses ('count'), or which ('names')
+    hint = data.get('hint')
+    engine = get_hint_engine() if hint in ('count', 'names') else None
+    previous = data.get('previous_guesses') or []
+    if engine and isinstance(previous, list) and len(previous) <= MAX_BATCH_GUESSES:
+        guesses = [p for p in (find_pokemon(n) for n in previous if isinstance(n, str)) if p] + [guess]
+        result = dict(result)
+        result.update(engine.hint(guesses, target, names=hint == 'names'))
     return jsonify(result)
 
+@app.route('/check_guesses', methods=['POST'])
+def check_guesses():
+    """Evaluate a list of guesses against one game, e.g. to restore a board after a reload."""
+    data = request.json
+    names = data.get('guesses')
+    if not isinstance(names, list) or len(names) > MAX_BATCH_GUESSES:
+        return jsonify({'error': f'guesses must be a list of at most {MAX_BATCH_GUESSES} names.'}), 400
+    warm_daily_tables()
+    try:
+        target = resolve_target(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    # One lookup for the whole board, so every result sees the same target measurements
+    target_lookup = lookup_weight_height(target)
+    results = []
+    for name in names:
+        guess = find_pokemon(name) if isinstance(name, str) else None
+        if guess:
+            results.append(compare_guess(guess, target, target_lookup))
+        else:
+            results.append({'guess': name, 'error': 'Pokemon not found.'})
+    return jsonify({'results': results})
+
 @app.route('/pokemon_of_the_day', methods=['GET'])
 def pokemon_of_the_day():
     # Check for custom game code
     code = request.args.get('game')
-    if code and code in custom_games:
-        norm = custom_games[code]
-        matches = [p for p in POKEMON_LIST if p.get('canonical', canonical_name(p['name'])) == norm]
-        if matches:
-            target = max(matches, key=lambda p: p.get('generation', 0))
-            return jsonify({'name': target['name']})
-    timezone_offset = int(request.args.get('timezone_offset', 0))
-    target = get_pokemon_of_the_day(timezone_offset)
-    return jsonify({'name': target['name']})
+    target = resolve_custom_game(code)
+    if target:
+        return jsonify({'name': target.name})
+    timezone_offset = request.args.get('timezone_offset', 0)
+    try:
+        target = get_pokemon_for_date(resolve_puzzle_date(request.args.get('date'), timezone_offset))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'name': target.name})
 
-@app.route('/pokemon_names', methods=['GET'])
-def pokemon_names():
-    def display_name(name):
-        # Normalize for display
-        n = name.replace('-', ' ').replace('_', ' ').replace('.', '').replace("'", '').lower()
-        if n == 'nidoranmale':
-            return 'Nidoran♂'
-        if n == 'nidoranfemale':
-            return 'Nidoran♀'
-        if n == 'darmanitan galar standard':
-            return 'Galarian Darmanitan'
-        # Paldean Tauros forms
-        if n in ['tauros paldea combat breed', 'tauros paldea combat']:
-            return 'Paldean Tauros Combat'
-        if n in ['tauros paldea blaze breed', 'tauros paldea blaze']:
-            return 'Paldean Tauros Blaze'
-        if n in ['tauros paldea aqua breed', 'tauros paldea aqua']:
-            return 'Paldean Tauros Aqua'
-        if n == 'wooper paldea':
-            return 'Paldean Wooper'
-        # Toxtricity forms
-        if n in ['toxtricityamped', 'toxtricity amped', 'toxtricity-amped', 'toxtricity_amped']:
-            return 'Toxtricity (Amped)'
-        if n in ['toxtricitylowkey', 'toxtricity low key', 'toxtricity-low-key', 'toxtricity_low_key']:
-            return 'Toxtricity (Low Key)'
-        # Basculegion forms
-        if n == 'basculegionmale':
-            return 'Basculegion'
-        if n == 'basculegionfemale':
-            return 'Basculegion'
-        # Hisuian forms
-        if n.endswith(' hisui'):
-            base = n[:-6]
-            return f'Hisuian {base.title()}'
-        # Galarian forms
-        if n.endswith(' galar'):
-            base = n[:-6]
-            return f'Galarian {base.title()}'
-        # Alolan forms
-        if n.endswith(' alola'):
-            base = n[:-6]
-            return f'Alolan {base.title()}'
-        # Paldean forms
-        if n.endswith(' paldea'):
-            base = n[:-7]
-            return f'Paldean {base.title()}'
-        # Lycanroc forms
-        if n.startswith('lycanroc '):
-            parts = n.split()
-            if len(parts) == 2:
-                return 'Lycanroc ' + parts[1].capitalize()
-            else:
-                return 'Lycanroc'
-        if n in ['flabébé', 'flabebe']:
-            return 'Flabebe'
-        # Default: capitalize each word
-        return ' '.join([w.capitalize() for w in n.split()])
-    def canonical_name(name):
-        n = name.replace('-', ' ').replace('_', ' ').replace('.', '').replace("'", '').lower().strip()
-        # Handle regional forms (prefix or suffix)
-        region_map = {
-            'hisuian': 'hisui',
-            'galarian': 'galar',
-            'alolan': 'alola',
-            'paldean': 'paldea',
-        }
-        for region_prefix, region_suffix in region_map.items():
-            if n.startswith(region_prefix + ' '):
-                n = n[len(region_prefix):].strip() + ' ' + region_suffix
-            elif n.endswith(' ' + region_suffix):
-                pass
-        n = n.replace(' ', '')
-        return n
+@app.route('/dataset_version', methods=['GET'])
+def dataset_version():
+    dataset = current_snapshot().dataset
+    return jsonify({'hash': dataset['hash'], 'format': dataset['format']})
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.labels(route=route, method=request.method).observe(elapsed)
+        REQUESTS.labels(route=route, method=request.method, status=response.status_code).inc()
+        logger.debug('%s %s -> %s in %.1f ms', request.method, route, response.status_code, elapsed * 1000,
+                     extra={'route': route, 'method': request.method, 'status': response.status_code,
+                            'duration_ms': round(elapsed * 1000, 3)})
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape target (per-process values; see metrics.py)."""
+    return app.response_class(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+@app.after_request
+def add_dataset_version_header(response):
+    # Lets clients key their caches on the dataset build
+    response.headers['X-Dataset-Version'] = current_snapshot().dataset['hash']
+    return response
+
+# Flavor texts built offline by build_pokedex_entries.py, keyed by species
+POKEDEX_ENTRIES_FILE = os.path.join(os.path.dirname(__file__), 'pokedex_entries.json')
+POKEDEX_ENTRY_MAX_AGE = 30 * 24 * 3600
+_pokedex_entries = None
+
+def get_pokedex_entries():
+    """(species -> [flavor texts], store version or None if not built), loaded on first use."""
+    global _pokedex_entries
+    if _pokedex_entries is None:
+        try:
+            with open(POKEDEX_ENTRIES_FILE, 'rb') as f:
+                raw = f.read()
+            _pokedex_entries = (json.loads(raw), hashlib.sha256(raw).hexdigest()[:16])
+        except FileNotFoundError:
+            _pokedex_entries = ({}, None)
+    return _pokedex_entries
+
+@app.route('/pokedex_entry/<name>', methods=['GET'])
+def pokedex_entry(name):
+    pokemon = find_pokemon(name)
+    entries, version = get_pokedex_entries()
+    # 404 until the store is built, or for a species its build failed to fetch;
+    # the page then asks PokéAPI. An empty list means PokéAPI has none either.
+    if pokemon is None or pokemon.species not in entries:
+        return jsonify({'error': 'No Pokédex entry found.'}), 404
+    response = jsonify({'name': pokemon.canonical, 'entries': entries[pokemon.species]})
+    response.set_etag(f'{version}-{pokemon.canonical}')
+    response.cache_control.public = True
+    response.cache_control.max_age = POKEDEX_ENTRY_MAX_AGE
+    return response.make_conditional(request)
+
+# Resized sprite derivatives from build_sprites.py; file names carry a content hash
+SPRITES_DIR = os.path.join(os.path.dirname(__file__), 'static', 'sprites')
+SPRITE_MANIFEST_FILE = os.path.join(SPRITES_DIR, 'manifest.json')
+SPRITE_MAX_AGE = 365 * 24 * 3600
+_sprite_manifest = None
+
+def get_sprite_manifest():
+    """(sprite name -> hash, atlas section or None, manifest version), loaded on first use."""
+    global _sprite_manifest
+    if _sprite_manifest is None:
+        try:
+            with open(SPRITE_MANIFEST_FILE, 'rb') as f:
+                raw = f.read()
+            manifest = json.loads(raw)
+            _sprite_manifest = (manifest['sprites'], manifest.get('atlas'), hashlib.sha256(raw).hexdigest()[:16])
+        except FileNotFoundError:
+            _sprite_manifest = ({}, None, 'empty')
+    return _sprite_manifest
+
+@app.route('/sprite_manifest', methods=['GET'])
+def sprite_manifest():
+    sprites, atlas, version = get_sprite_manifest()
+    response = jsonify({'sprites': sprites, 'atlas': atlas})
+    response.set_etag(version)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
+
+@app.route('/sprites/<path:filename>', methods=['GET'])
+def sprite(filename):
+    response = send_from_directory(SPRITES_DIR, filename, max_age=SPRITE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+# Longer queries cannot match any name and only cost deletion variants
+SUGGEST_MAX_QUERY = 64
+SUGGEST_MAX_LIMIT = 50
+
+def build_pokemon_names(pokemon_list):
+    """Autocomplete entries ({'display', 'value'}) for every Pokémon plus regional-form aliases."""
     names = []
     seen = set()
-    all_pokemon = list(POKEMON_LIST)
+    all_pokemon = list(pokemon_list)
     for p in all_pokemon:
-        norm = p.get('canonical', canonical_name(p['name']))
+        norm = p.canonical
         if norm in seen:
             continue
         seen.add(norm)
         names.append({
-            'display': display_name(p['name']),
+            'display': p.display,
             'value': norm
         })
     # Add aliases for regional forms and special forms
@@ -695,8 +639,8 @@ def pokemon_names():
         'paldea': 'paldean',
     }
     for p in all_pokemon:
-        n = p['name'].replace('-', ' ').replace('_', ' ').replace('.', '').replace("'", '').lower().strip()
-        canon = p.get('canonical', canonical_name(p['name']))
+        n = p.name.replace('-', ' ').replace('_', ' ').replace('.', '').replace("'", '').lower().strip()
+        canon = p.canonical
         # If canonical ends with a regional suffix, generate all aliases
         for region_suffix, region_prefix in region_map.items():
             if canon.endswith(region_suffix):
@@ -726,7 +670,281 @@ def pokemon_names():
                             'value': canon
                         })
                         seen.add(alias_norm)
-    return jsonify({'names': names})
+    return names
+
+# The names payload only changes with the dataset, so each snapshot serializes
+# it once and compresses it once on first request; every request just picks a variant
+NAMES_MAX_AGE = 365 * 24 * 3600
+
+def get_names_variants(snapshot=None):
+    """{content-coding: body} for /pokemon_names; brotli at quality 11 takes ~90ms, hence lazy."""
+    snapshot = snapshot or current_snapshot()
+    if snapshot.names_variants is None:
+        body = snapshot.names_body
+        variants = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['br'] = brotli.compress(body, quality=11)
+        snapshot.names_variants = variants
+    return snapshot.names_variants
+
+@app.route('/pokemon_names', methods=['GET'])
+def pokemon_names():
+    snapshot = current_snapshot()
+    variants = get_names_variants(snapshot)
+    encoding = 'identity'
+    for candidate in ('br', 'gzip'):
+        if candidate in variants and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+    response = app.response_class(variants[encoding], mimetype='application/json')
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    # Strong validators must differ between encodings of the same payload
+    etag = snapshot.names_etag
+    response.set_etag(etag if encoding == 'identity' else f'{etag}-{encoding}')
+    response.cache_control.public = True
+    if request.args.get('v') == etag:
+        # The page asks for ?v=<etag>, so that URL never changes content
+        response.cache_control.max_age = NAMES_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = 3600
+    return response.make_conditional(request)
+
+def get_suggest_index(snapshot=None):
+    """Suggestion index over the snapshot's names, built on first use (~0.3s)."""
+    snapshot = snapshot or current_snapshot()
+    if snapshot.suggest_index is None:
+        snapshot.suggest_index = suggest.SuggestIndex(snapshot.names)
+    return snapshot.suggest_index
+
+@app.route('/suggest', methods=['GET'])
+def suggest_names():
+    query = request.args.get('q', '')[:SUGGEST_MAX_QUERY]
+    limit = min(max(request.args.get('limit', suggest.DEFAULT_LIMIT, type=int), 1), SUGGEST_MAX_LIMIT)
+    matches, did_you_mean = get_suggest_index().suggest(query, limit)
+    response = jsonify({'matches': matches, 'did_you_mean': did_you_mean})
+    # Results only change with the dataset, which X-Dataset-Version identifies
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
+
+class Snapshot:
+    """One dataset build and every lookup structure derived from it.
+
+    A request uses a single snapshot throughout (see current_snapshot()), so
+    its guess, target and name lists always come from the same build, even
+    while reload_dataset() swaps in the next one. Days the dataset records a
+    pick for keep that target.
+    """
+    def __init__(self, dataset):
+        self.dataset = dataset
+        # Lookup data is read-only (tuples and mapping proxies), so it can be
+        # shared between pre-forked workers; see create_app()
+        self.pokemon_list = pokemon_dataset.load_records(pokemon_dataset.PokemonRecord, dataset['pokemon_fields'],
+                                                         dataset['pokemon'])
+        self.index, self.forms = map(pokemon_dataset.freeze_index, build_pokemon_index(self.pokemon_list))
+        # Dataset row of each entry, which is what tokens carry and comparison tables are keyed by
+        self.rows = pokemon_dataset.freeze_index({id(p): i for i, p in enumerate(self.pokemon_list)})
+        self.calendar = build_daily_calendar(datetime.datetime.now(datetime.timezone.utc).date(),
+                                             CALENDAR_PAST_DAYS, CALENDAR_FUTURE_DAYS, len(self.pokemon_list))
+        self.calendar.update(recorded_calendar(self))
+        # Every possible target, one entry per canonical name, for remaining-candidate hints
+        self.hint_candidates = tuple(p for p in self.pokemon_list if self.index[p.canonical] is p)
+        self.names = tuple(build_pokemon_names(self.pokemon_list))
+        self.names_body = json.dumps({'names': self.names}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.names_etag = hashlib.sha256(dataset['hash'].encode() + self.names_body).hexdigest()[:16]
+        # Built on first use, or up front by prepare_snapshot()
+        self.names_variants = None
+        self.suggest_index = None
+        self.hint_engine = None
+        self.token_names = {}  # token version -> {name check: canonical name}
+        self.comparison_tables = OrderedDict()  # target row -> {guess row: result}, least recently used first
+        self.comparison_pending = set()
+        self.warmed_day = None
+
+# The snapshot a request started with; a context variable rather than g,
+# which costs ~1 µs per lookup and is read several times per guess
+_request_snapshot = contextvars.ContextVar('request_snapshot', default=None)
+
+def current_snapshot():
+    """The snapshot of the request being served, or the latest one outside requests."""
+    return _request_snapshot.get() or _snapshot
+
+@app.before_request
+def pin_snapshot():
+    _request_snapshot.set(_snapshot)
+
+@app.teardown_request
+def unpin_snapshot(exc):
+    _request_snapshot.set(None)
+
+def prepare_snapshot(snapshot):
+    """Build everything a snapshot would otherwise build on first use, in the calling thread."""
+    get_suggest_index(snapshot)
+    get_names_variants(snapshot)
+    get_hint_engine(snapshot)
+    for version in game_tokens.PAYLOADS:
+        get_token_names(version, snapshot)
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    for target in daily_targets(today, snapshot):
+        if has_measurements(target) and COMPARISON_TABLE_SLOTS > 0:
+            _store_comparison_table(snapshot, snapshot.rows[id(target)])
+    snapshot.warmed_day = today
+
+def publish_snapshot(snapshot):
+    global _snapshot
+    previous, _snapshot = _snapshot, snapshot
+    if previous is not None:
+        DATASET_INFO.remove(hash=previous.dataset.get('hash'), format=previous.dataset.get('format'))
+    DATASET_INFO.labels(hash=snapshot.dataset.get('hash'), format=snapshot.dataset.get('format')).set(1)
+
+# The dataset file and its sources are checked every DATASET_WATCH_SECONDS
+# (0 to disable); a change that has settled reloads the dataset. Under
+# gunicorn the master watches and recycles the workers instead (see
+# gunicorn.conf.py), so they keep sharing one copy.
+DATASET_WATCH_SECONDS = float(os.environ.get('DATASET_WATCH_SECONDS', 10))
+DATASET_WATCH_FILES = (pokemon_dataset.DATASET_FILE,) + tuple(pokemon_dataset.SOURCE_FILES.values())
+_reload_lock = threading.Lock()
+_watcher_lock = threading.Lock()
+_dataset_watcher = None
+
+def file_state(path):
+    """(mtime, size) of a file, None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def dataset_files_state():
+    return tuple(file_state(path) for path in DATASET_WATCH_FILES)
+
+def load_watched_dataset():
+    """pokemon_dataset.load_current_dataset(), noting the watched files' state in _dataset_files.
+
+    Startup and reloads both go through here, so a restart serves what a
+    reload would: a source edited since pokemon_dataset.json was written is
+    compiled in and written back either way.
+    """
+    global _dataset_files
+    _dataset_files = dataset_files_state()
+    dataset, written = pokemon_dataset.load_current_dataset()
+    if written:
+        # Our own rewrite of pokemon_dataset.json is not a change to react to
+        _dataset_files = (file_state(pokemon_dataset.DATASET_FILE),) + _dataset_files[1:]
+    return dataset
+
+def reload_dataset():
+    """Load the data files again and, if the dataset changed, swap in a new snapshot.
+
+    The new snapshot is built and warmed while requests keep using the current
+    one, then published with a single assignment; requests in flight finish on
+    the snapshot they started with. Returns True if a new snapshot was
+    published. On errors the current snapshot stays.
+    """
+    with _reload_lock:
+        started = time.perf_counter()
+        previous = _snapshot.dataset['hash']
+        try:
+            dataset = load_watched_dataset()
+            if dataset['hash'] == previous:
+                DATASET_RELOADS.labels(result='unchanged').inc()
+                return False
+            snapshot = Snapshot(dataset)
+            prepare_snapshot(snapshot)
+        except Exception:
+            DATASET_RELOADS.labels(result='error').inc()
+            logger.exception('Reloading the dataset failed; still serving %s', previous[:12])
+            return False
+        publish_snapshot(snapshot)
+    DATASET_RELOADS.labels(result='reloaded').inc()
+    elapsed = time.perf_counter() - started
+    logger.info('Dataset reloaded: %s -> %s, %d Pokémon, in %.0f ms', previous[:12], dataset['hash'][:12],
+                len(snapshot.pokemon_list), elapsed * 1000,
+                extra={'previous_hash': previous, 'hash': dataset['hash'], 'duration_ms': round(elapsed * 1000, 1)})
+    return True
+
+def watch_dataset_files(interval, on_change):
+    seen = _dataset_files
+    while True:
+        time.sleep(interval)
+        state = dataset_files_state()
+        # Wait until two checks agree: editors and copies may write a file in steps
+        if state != _dataset_files and state == seen:
+            on_change()
+            # If on_change only asked for a reload, give it time to happen
+            state = None
+        seen = state
+
+def start_dataset_watcher(on_change=None):
+    """Watch the data files in a daemon thread; a settled change calls on_change (default reload_dataset).
+
+    Processes forked afterwards inherit the (started) watcher and do not start
+    their own, which is how gunicorn's workers leave reloads to the master.
+    """
+    global _dataset_watcher
+    with _watcher_lock:
+        if _dataset_watcher is None and DATASET_WATCH_SECONDS > 0:
+            _dataset_watcher = threading.Thread(target=watch_dataset_files,
+                                                args=(DATASET_WATCH_SECONDS, on_change or reload_dataset),
+                                                name='dataset-watcher', daemon=True)
+            _dataset_watcher.start()
+
+@app.before_request
+def start_worker_dataset_watcher():
+    # Single-process servers reload in place; started on the first request,
+    # i.e. after a pre-fork server has forked the worker
+    if _dataset_watcher is None:
+        start_dataset_watcher()
+
+_snapshot = None
+_dataset_files = None
+publish_snapshot(Snapshot(load_watched_dataset()))
+
+@app.cli.command('refresh-data')
+def refresh_data_command():
+    """Refetch special forms from PokéAPI and rebuild pokemon_dataset.json."""
+    import build_dataset
+    build_dataset.refresh_dataset()
+
+def start_background_refresh(interval_hours):
+    """Periodically refresh the dataset file in a daemon thread.
+
+    Run it in one process only (the gunicorn master, see gunicorn.conf.py),
+    never at import: every worker would refetch and rewrite the same files.
+    Running processes pick the new file up through their dataset watcher.
+    """
+    def run():
+        import build_dataset
+        while True:
+            time.sleep(interval_hours * 3600)
+            try:
+                build_dataset.refresh_dataset()
+            except Exception:
+                logger.exception('Background dataset refresh failed')
+    thread = threading.Thread(target=run, name='dataset-refresh', daemon=True)
+    thread.start()
+    return thread
+
+def create_app():
+    """The app with every shared structure built, for pre-fork servers (see gunicorn.conf.py).
+
+    Called once in the master before it forks. Everything the workers would
+    otherwise build lazily (suggest index, compressed name lists, hint matrix,
+    today's comparison tables) is built here so all workers share one copy.
+    gc.freeze() then moves every object allocated so far out of the garbage
+    collector's reach: a collection in a worker would otherwise write to each
+    shared object's GC header and un-share its copy-on-write page.
+    """
+    # Built synchronously: threads do not survive the fork
+    prepare_snapshot(_snapshot)
+    get_pokedex_entries()
+    get_sprite_manifest()
+    gc.collect()
+    gc.freeze()
+    return app
 
 if __name__ == '__main__':
     app.run(debug=True, port=5002)
@@ -1,21 +1,17 @@
 import json
-import os
+import pokemon_dataset
+from pokemon_dataset import DEFAULT_FORMS, normalize_name, build_cache_index  # noqa: F401
 
 def load_pokemon_cache(json_path):
     with open(json_path, encoding='utf-8') as f:
         return json.load(f)
 
-POKEMON_CACHE_FILE = os.path.join(os.path.dirname(__file__), 'pokemon_data.json')
-POKEMON_CACHE = load_pokemon_cache(POKEMON_CACHE_FILE)
+# Cache rows and the alias index come precompiled in pokemon_dataset.json
+# (weight/height already converted to kg/m)
+DATASET = pokemon_dataset.get_dataset()
+POKEMON_CACHE = pokemon_dataset.load_records(pokemon_dataset.CacheRecord, DATASET['cache_fields'], DATASET['cache'])
+POKEMON_CACHE_INDEX = pokemon_dataset.freeze_index({alias: POKEMON_CACHE[row] for alias, row in DATASET['cache_index'].items()})
 
 # Helper: get cache entry by normalized name (case-insensitive, ignore dashes/underscores)
 def find_pokemon_cache_entry(name):
-    # Normalize: lowercase, remove dashes, underscores, and spaces
-    def normalize(s):
-        return s.replace('-', '').replace('_', '').replace(' ', '').strip().lower()
-    norm = normalize(name)
-    for entry in POKEMON_CACHE:
-        entry_norm = normalize(entry['name'])
-        if norm == entry_norm:
-            return entry
-    return None
+    return POKEMON_CACHE_INDEX.get(normalize_name(name))
@@ -0,0 +1,274 @@
+"""Runtime access to the compiled Pokémon dataset (pokemon_dataset.json).
+
+The dataset is produced by build_dataset.py from the National Pokédex CSV,
+special_forms_cache.json and pokemon_data.json. Everything the app needs at
+request time (canonical keys, display names, weight/height in kg/m and the
+cache alias index) is already resolved in it, so loading is a single
+json.load.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from types import MappingProxyType
+import metrics
+
+DATASET_FILE = os.path.join(os.path.dirname(__file__), 'pokemon_dataset.json')
+DATASET_FORMAT = 2
+# What build_dataset.py compiles it from; their hashes are recorded under 'sources'
+SOURCE_FILES = {
+    'csv': os.path.join(os.path.dirname(__file__), 'Pokemon Data - National Pokedex.csv'),
+    'special_forms': os.path.join(os.path.dirname(__file__), 'special_forms_cache.json'),
+    'pokemon_data': os.path.join(os.path.dirname(__file__), 'pokemon_data.json'),
+}
+
+logger = logging.getLogger('pokemon.dataset')
+
+# Archive window of the daily puzzle; build_dataset.py records each day's pick in it
+CALENDAR_PAST_DAYS = int(os.environ.get('DAILY_CALENDAR_PAST_DAYS', 365))
+
+DATASET_LOAD_SECONDS = metrics.gauge('dataset_load_seconds', 'Time taken to load (or compile) the dataset.')
+
+POKEMON_FIELDS = ['name', 'canonical', 'display', 'species', 'generation', 'type1', 'type2', 'weight', 'height', 'api_name']
+CACHE_FIELDS = ['name', 'api_name', 'generation', 'type1', 'type2', 'weight', 'height']
+
+def canonical_name(name):
+    n = name.replace('-', ' ').replace('_', ' ').replace('.', '').replace("'", '').lower().strip()
+    # Handle regional forms (prefix or suffix)
+    region_map = {
+        'hisuian': 'hisui',
+        'galarian': 'galar',
+        'alolan': 'alola',
+        'paldean': 'paldea',
+    }
+    for region_prefix, region_suffix in region_map.items():
+        if n.startswith(region_prefix + ' '):
+            # e.g. 'hisuian zoroark' -> 'zoroark hisui'
+            n = n[len(region_prefix):].strip() + ' ' + region_suffix
+        elif n.endswith(' ' + region_suffix):
+            # already in correct form
+            pass
+    n = n.replace(' ', '')
+    return n
+
+def display_name(name):
+    # Normalize for display
+    n = name.replace('-', ' ').replace('_', ' ').replace('.', '').replace("'", '').lower()
+    if n == 'nidoranmale':
+        return 'Nidoran♂'
+    if n == 'nidoranfemale':
+        return 'Nidoran♀'
+    if n == 'darmanitan galar standard':
+        return 'Galarian Darmanitan'
+    # Paldean Tauros forms
+    if n in ['tauros paldea combat breed', 'tauros paldea combat']:
+        return 'Paldean Tauros Combat'
+    if n in ['tauros paldea blaze breed', 'tauros paldea blaze']:
+        return 'Paldean Tauros Blaze'
+    if n in ['tauros paldea aqua breed', 'tauros paldea aqua']:
+        return 'Paldean Tauros Aqua'
+    if n == 'wooper paldea':
+        return 'Paldean Wooper'
+    # Toxtricity forms
+    if n in ['toxtricityamped', 'toxtricity amped', 'toxtricity-amped', 'toxtricity_amped']:
+        return 'Toxtricity (Amped)'
+    if n in ['toxtricitylowkey', 'toxtricity low key', 'toxtricity-low-key', 'toxtricity_low_key']:
+        return 'Toxtricity (Low Key)'
+    # Basculegion forms
+    if n == 'basculegionmale':
+        return 'Basculegion'
+    if n == 'basculegionfemale':
+        return 'Basculegion'
+    # Hisuian forms
+    if n.endswith(' hisui'):
+        base = n[:-6]
+        return f'Hisuian {base.title()}'
+    # Galarian forms
+    if n.endswith(' galar'):
+        base = n[:-6]
+        return f'Galarian {base.title()}'
+    # Alolan forms
+    if n.endswith(' alola'):
+        base = n[:-6]
+        return f'Alolan {base.title()}'
+    # Paldean forms
+    if n.endswith(' paldea'):
+        base = n[:-7]
+        return f'Paldean {base.title()}'
+    # Lycanroc forms
+    if n.startswith('lycanroc '):
+        parts = n.split()
+        if len(parts) == 2:
+            return 'Lycanroc ' + parts[1].capitalize()
+        else:
+            return 'Lycanroc'
+    if n in ['flabébé', 'flabebe']:
+        return 'Flabebe'
+    # Default: capitalize each word
+    return ' '.join([w.capitalize() for w in n.split()])
+
+# Names whose bare species spelling should resolve to a specific default form
+# (gendered/standard forms, matching the sprite conventions)
+DEFAULT_FORMS = {
+    'maushold': 'mausholdfamilyofthree',
+    'indeedee': 'indeedeemale',
+    'meowstic': 'meowsticmale',
+    'frillish': 'frillishmale',
+    'jellicent': 'jellicentmale',
+    'pyroar': 'pyroarmale',
+    'unfezant': 'unfezantmale',
+    'hippopotas': 'hippopotasfemale',
+    'hippowdon': 'hippowdonfemale',
+    'basculin': 'basculinredstriped',
+    'basculegion': 'basculegionmale',
+    'oricorio': 'oricoriobaile',
+    'lycanroc': 'lycanrocmidday',
+    'toxtricity': 'toxtricityamped',
+    'flabébé': 'flabebe',
+    'nidoranfemale': 'nidoranf',
+    'nidoranmale': 'nidoranm',
+    'keldeo': 'keldeoordinary',
+}
+
+# Normalize: lowercase, remove dashes, underscores, spaces, dots and apostrophes
+def normalize_name(name):
+    return name.replace('-', '').replace('_', '').replace(' ', '').replace('.', '').replace("'", '').strip().lower()
+
+def build_cache_index(entries):
+    """Map every normalized name (and default-form alias) to its cache entry."""
+    index = {}
+    for entry in entries:
+        index.setdefault(normalize_name(entry['name']), entry)
+    for entry in entries:
+        if entry.get('api_name'):
+            index.setdefault(normalize_name(entry['api_name']), entry)
+    # Species with no plain entry default to their first listed form (deoxys -> deoxys-normal)
+    for entry in entries:
+        api_name = entry.get('api_name') or ''
+        if '-' in api_name:
+            index.setdefault(normalize_name(api_name.split('-')[0]), entry)
+    for alias, target in DEFAULT_FORMS.items():
+        if target in index:
+            index[alias] = index[target]
+    # Every Keldeo form uses the ordinary form's measurements
+    if 'keldeoordinary' in index:
+        for key in [k for k in index if k.startswith('keldeo')]:
+            index[key] = index['keldeoordinary']
+    return index
+
+def rows_to_dicts(fields, rows):
+    return [dict(zip(fields, row)) for row in rows]
+
+class Record:
+    """Read-only row with one slot per field instead of a per-entry dict.
+
+    Type names are interned, so the ~2,000 copies json.load produces collapse
+    to one string per type.
+    """
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            value = values.get(field)
+            if field in ('type1', 'type2') and value:
+                value = sys.intern(value)
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is read-only')
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{f}={getattr(self, f)!r}' for f in self.__slots__)})"
+
+class PokemonRecord(Record):
+    """A POKEMON_FIELDS row, plus normalized: normalize_name(name)."""
+    __slots__ = tuple(POKEMON_FIELDS) + ('normalized',)
+
+    def __init__(self, **values):
+        super().__init__(normalized=normalize_name(values['name']), **values)
+
+class CacheRecord(Record):
+    __slots__ = tuple(CACHE_FIELDS)
+
+def load_records(record_type, fields, rows):
+    """Dataset rows (as stored under fields) as a tuple of record_type."""
+    return tuple(record_type(**dict(zip(fields, row))) for row in rows)
+
+def freeze_index(index):
+    """Read-only view of a lookup dict, with list values turned into tuples."""
+    return MappingProxyType({key: tuple(value) if isinstance(value, list) else value for key, value in index.items()})
+
+def daily_index(day, count):
+    """Row of day's target among count rows, for days the dataset records no pick for."""
+    seed = int(hashlib.sha256(day.strftime('%Y-%m-%d').encode()).hexdigest(), 16)
+    return seed % count
+
+def last_started_day():
+    # The latest day that has begun anywhere (UTC+14)
+    return (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=14)).date()
+
+def file_sha256(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def source_hashes():
+    return {key: file_sha256(path) for key, path in SOURCE_FILES.items()}
+
+def read_dataset(path=DATASET_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def load_dataset(path=DATASET_FILE):
+    """Read the compiled dataset, compiling it in memory if the file is missing or outdated."""
+    started = time.perf_counter()
+    try:
+        data = read_dataset(path)
+    except (OSError, ValueError):
+        data = None
+    if data is None or data.get('format') != DATASET_FORMAT:
+        import build_dataset
+        data = build_dataset.compile_dataset(data)
+    DATASET_LOAD_SECONDS.set(time.perf_counter() - started)
+    return data
+
+def load_current_dataset(path=DATASET_FILE):
+    """The dataset as of its current sources: (data, whether path was rewritten).
+
+    If path is missing, outdated or older than a source, the dataset is
+    recompiled and written back, so a restart serves the same data and daily
+    picks as the reload that compiled it. If the write fails, the compiled
+    data is still returned.
+    """
+    started = time.perf_counter()
+    try:
+        data = read_dataset(path)
+    except (OSError, ValueError):
+        data = None
+    written = False
+    if data is None or data.get('format') != DATASET_FORMAT or data.get('sources') != source_hashes():
+        import build_dataset
+        data = build_dataset.compile_dataset(data)
+        try:
+            build_dataset.write_dataset(data, path)
+            written = True
+        except OSError:
+            logger.exception('Could not write %s; serving the recompiled dataset from memory', path)
+    DATASET_LOAD_SECONDS.set(time.perf_counter() - started)
+    return data, written
+
+_dataset = None
+
+def get_dataset():
+    """Process-wide dataset, loaded on first use."""
+    global _dataset
+    if _dataset is None:
+        _dataset = load_dataset()
+    return _dataset
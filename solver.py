@@ -0,0 +1,175 @@
+"""Offline opener and difficulty analysis under /check_guess's feedback rules.
+
+    python solver.py [--workers N] [--top 20] [--output solver_report.json]
+
+Every candidate is scored as an opening guess against every possible target
+(feedback codes from hints.py; N^2 comparisons), by the expected number of
+targets left afterwards. The best openers are then evaluated one level deeper
+with the best follow-up for each first feedback. Finally a greedy solver
+(always play the guess that leaves the fewest expected candidates) is run
+from the best opener, giving the number of guesses each target takes and the
+groups of targets that no feedback can tell apart.
+
+Work is spread over a process pool; each worker builds the feedback matrix
+once. Requires NumPy.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import hints
+import pokemon_dataset
+
+OUTPUT_FILE = os.path.join(os.path.dirname(__file__), 'solver_report.json')
+CHUNK = 64
+
+def load_candidates():
+    """One entry per canonical name (the highest-generation row), like the app's index."""
+    data = pokemon_dataset.get_dataset()
+    best = {}
+    for p in pokemon_dataset.load_records(pokemon_dataset.PokemonRecord, data['pokemon_fields'], data['pokemon']):
+        current = best.get(p.canonical)
+        if current is None or (p.generation or 0) > (current.generation or 0):
+            best[p.canonical] = p
+    return list(best.values())
+
+_matrix = None
+
+def init_worker():
+    global _matrix
+    columns = hints.Columns(load_candidates())
+    _matrix = hints.feedback_codes(columns[:, None], columns[None, :])
+
+def partition_scores(codes):
+    """Sum of squared partition sizes for each row of a (guesses x targets) code matrix.
+
+    Divided by the number of targets this is the expected number of targets
+    left after the guess.
+    """
+    rows = codes.shape[0]
+    offsets = (np.arange(rows, dtype=np.int64) * hints.FEEDBACK_CODES)[:, None]
+    counts = np.bincount((codes + offsets).ravel(), minlength=rows * hints.FEEDBACK_CODES)
+    counts = counts.reshape(rows, hints.FEEDBACK_CODES)
+    return (counts * counts).sum(axis=1), counts.max(axis=1), (counts > 0).sum(axis=1)
+
+def score_openers(rows):
+    squares, worst, partitions = partition_scores(_matrix[rows])
+    return [(int(r), int(s), int(w), int(p)) for r, s, w, p in zip(rows, squares, worst, partitions)]
+
+def best_guess(targets):
+    """Guess leaving the fewest expected candidates among targets; ties prefer a possible target."""
+    squares = partition_scores(_matrix[:, targets])[0] * 2
+    squares[targets] -= 1
+    return int(np.argmin(squares))
+
+def depth_two(opener):
+    """Expected candidates left after the opener plus the best follow-up for each feedback."""
+    n = _matrix.shape[1]
+    codes = _matrix[opener]
+    total = 0
+    follow_ups = []
+    for code in np.unique(codes):
+        part = np.flatnonzero(codes == code)
+        if len(part) == 1:
+            total += 1
+            continue
+        guess = best_guess(part)
+        total += int(partition_scores(_matrix[guess:guess + 1, part])[0][0])
+        follow_ups.append((len(part), guess))
+    follow_ups.sort(reverse=True)
+    return opener, total / n, follow_ups[:5]
+
+def solve(targets, guess, depth):
+    """{target: guesses needed} for a set of targets that all gave the same feedback so far."""
+    result = {}
+    pending = [(np.asarray(targets), guess, depth)]
+    while pending:
+        targets, guess, depth = pending.pop()
+        codes = _matrix[guess, targets]
+        for code in np.unique(codes):
+            part = targets[codes == code]
+            if guess in part:
+                result[guess] = depth
+                part = part[part != guess]
+            if len(part) == 1:
+                result[int(part[0])] = depth + 1
+            elif len(part):
+                next_guess = best_guess(part)
+                if next_guess not in part and len(np.unique(_matrix[next_guess, part])) == 1:
+                    next_guess = int(part[0])  # Nothing splits them any more; try them one by one
+                pending.append((part, next_guess, depth + 1))
+    return result
+
+def solve_partition(args):
+    return solve(*args)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Score opening guesses and per-target difficulty.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--top', type=int, default=20, help='openers to list and to evaluate at depth 2')
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    candidates = load_candidates()
+    n = len(candidates)
+    names = [p.display for p in candidates]
+    init_worker()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as pool:
+        chunks = [np.arange(i, min(i + CHUNK, n)) for i in range(0, n, CHUNK)]
+        scores = [s for chunk in pool.map(score_openers, chunks) for s in chunk]
+        scores.sort(key=lambda s: (s[1], s[2]))
+        top = [s[0] for s in scores[:args.top]]
+        deeper = sorted(pool.map(depth_two, top), key=lambda d: d[1])
+
+        opener = deeper[0][0]
+        codes = _matrix[opener]
+        parts = [(np.flatnonzero(codes == code), opener, 1) for code in np.unique(codes)]
+        guesses_needed = {}
+        for part in pool.map(solve_partition, parts):
+            guesses_needed.update(part)
+
+    # Targets with identical feedback columns can never be told apart
+    _, groups = np.unique(_matrix.T, axis=0, return_inverse=True)
+    groups = groups.ravel()
+    degenerate = [sorted(names[i] for i in np.flatnonzero(groups == g)) for g in np.unique(groups)
+                  if np.count_nonzero(groups == g) > 1]
+    needed = np.array([guesses_needed[i] for i in range(n)])
+
+    report = {
+        'dataset': pokemon_dataset.get_dataset().get('hash'),
+        'candidates': n,
+        'comparisons': n * n,
+        'best_openers': [{'name': names[r], 'expected_remaining': s / n, 'worst_case': w, 'feedback_groups': p}
+                         for r, s, w, p in scores[:args.top]],
+        'worst_openers': [{'name': names[r], 'expected_remaining': s / n, 'worst_case': w, 'feedback_groups': p}
+                          for r, s, w, p in scores[-args.top:]],
+        'depth_two': [{'opener': names[o], 'expected_remaining': e,
+                       'largest_follow_ups': [{'candidates': size, 'guess': names[g]} for size, g in follow]}
+                      for o, e, follow in deeper],
+        'greedy_solver': {
+            'opener': names[opener],
+            'mean_guesses': float(needed.mean()),
+            'max_guesses': int(needed.max()),
+            'histogram': {int(k): int(v) for k, v in zip(*np.unique(needed, return_counts=True))},
+            'hardest_targets': [{'name': names[i], 'guesses': int(needed[i])} for i in np.argsort(-needed, kind='stable')[:args.top]],
+        },
+        'indistinguishable_targets': degenerate,
+        'elapsed_s': time.perf_counter() - started,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{n} candidates, {n * n} guess/target comparisons in {report['elapsed_s']:.1f}s")
+    for entry in report['depth_two'][:5]:
+        print(f"  {entry['opener']:<24} {entry['expected_remaining']:.2f} left after two guesses")
+    solver = report['greedy_solver']
+    print(f"Greedy solver from {solver['opener']}: {solver['mean_guesses']:.2f} guesses on average, at most {solver['max_guesses']}")
+    print(f'{len(degenerate)} groups of targets no feedback can tell apart; report written to {args.output}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Keep static/pokemon/ in step with the dataset: one sprite per Pokémon, checksummed.
+
+For every dataset entry the sprite the page asks for (static/pokemon/<name>.png)
+is checked against sprite_sources.json, which records each file's SHA-256,
+dimensions and the URL it came from. Files that are missing, not a complete
+PNG, or whose checksum no longer matches are downloaded again on a bounded
+thread pool; everything else is left alone. Files present before the manifest
+existed are adopted as they are. Entries that still have no sprite are listed
+at the end.
+
+    python sprite_sync.py [--workers 8] [--dry-run | --no-download] [--check-sources] [--accept-local]
+
+Sources are tried in order: Showdown's gen9 and gen8 sprites, then PokéAPI's
+official artwork, HOME render and default sprite (`--source pokeapi` skips
+Showdown, e.g. against a local stub via POKEAPI_BASE_URL).
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import pokeapi_client
+import pokemon_dataset
+
+SPRITE_DIR = os.path.join(os.path.dirname(__file__), 'static', 'pokemon')
+MANIFEST_FILE = os.path.join(os.path.dirname(__file__), 'sprite_sources.json')
+MANIFEST_VERSION = 1
+SHOWDOWN_URLS = ('https://play.pokemonshowdown.com/sprites/gen9/regular/{}.png',
+                 'https://play.pokemonshowdown.com/sprites/gen8/regular/{}.png')
+# PokéAPI sprite fields, best first
+POKEAPI_SPRITES = (('other', 'official-artwork', 'front_default'), ('other', 'home', 'front_default'), ('front_default',))
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_END = b'\x00\x00\x00\x00IEND\xaeB`\x82'
+
+def sprite_name(p):
+    """File name stem the page requests for a dataset record (see renderGuesses in home.html)."""
+    if p.normalized in ('flabebe', 'flabébé'):
+        return 'flabebe'
+    if p.normalized == 'basculegionfemale':
+        return 'basculegion'
+    return re.sub(r'[^a-z0-9]', '', p.name.lower())
+
+def dataset_sprites():
+    """{sprite name: PokéAPI name} for every dataset entry."""
+    data = pokemon_dataset.get_dataset()
+    sprites = {}
+    for p in pokemon_dataset.load_records(pokemon_dataset.PokemonRecord, data['pokemon_fields'], data['pokemon']):
+        sprites.setdefault(sprite_name(p), p.api_name)
+    return sprites
+
+def png_info(data):
+    """(width, height) of a complete PNG file, or None if it is not one."""
+    if len(data) < 33 or not data.startswith(PNG_SIGNATURE) or data[12:16] != b'IHDR' or not data.endswith(PNG_END):
+        return None
+    width, height = struct.unpack('>II', data[16:24])
+    return (width, height) if width and height else None
+
+def describe(data, source):
+    width, height = png_info(data)
+    return {'sha256': hashlib.sha256(data).hexdigest(), 'width': width, 'height': height,
+            'bytes': len(data), 'source': source}
+
+def candidate_urls(name, sources):
+    if 'showdown' in sources:
+        yield from (url.format(name) for url in SHOWDOWN_URLS)
+    if 'pokeapi' in sources:
+        try:
+            data = pokeapi_client.get_json(f'pokemon/{name}')
+        except Exception as e:
+            print(f'  pokemon/{name}: {e}')
+            data = None
+        for path in POKEAPI_SPRITES if data else ():
+            url = data.get('sprites')
+            for key in path:
+                url = url.get(key) if isinstance(url, dict) else None
+            if url:
+                yield url
+
+def download(name, sources):
+    """(url, PNG bytes) from the first source that has a valid image, or (None, None)."""
+    for url in candidate_urls(name, sources):
+        try:
+            resp = pokeapi_client.get(url, cache=False)
+        except Exception as e:
+            print(f'  {url}: {e}')
+            continue
+        if resp.status_code == 200 and png_info(resp.content):
+            return url, resp.content
+    return None, None
+
+def write_sprite(path, data):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def load_manifest(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return manifest.get('sprites', {}) if manifest.get('version') == MANIFEST_VERSION else {}
+
+def check(name, recorded, accept_local):
+    """(status, entry): whether the file on disk can stay, and its manifest entry if so."""
+    path = os.path.join(SPRITE_DIR, f'{name}.png')
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return 'missing', None
+    if png_info(data) is None:
+        return 'corrupt', None
+    entry = describe(data, recorded.get('source') if recorded else None)
+    if recorded is None:
+        return 'adopted', entry
+    if entry['sha256'] != recorded.get('sha256'):
+        return ('accepted', entry) if accept_local else ('changed', None)
+    return 'ok', entry
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Download missing or damaged sprites and update their checksum manifest.')
+    parser.add_argument('--workers', type=int, default=8, help='parallel downloads')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would be downloaded')
+    parser.add_argument('--no-download', action='store_true', help='only check and record the sprites already on disk')
+    parser.add_argument('--check-sources', action='store_true',
+                        help='refetch every downloaded sprite and replace those whose source URL or content changed')
+    parser.add_argument('--accept-local', action='store_true',
+                        help='record local edits (checksum mismatches) instead of downloading over them')
+    parser.add_argument('--source', action='append', choices=('showdown', 'pokeapi'),
+                        help='sprite sources to use, in order (default: showdown, pokeapi)')
+    args = parser.parse_args(argv)
+    sources = args.source or ['showdown', 'pokeapi']
+
+    wanted = dataset_sprites()
+    previous = load_manifest(MANIFEST_FILE)
+    manifest = {}
+    fetch = {}
+    counts = {}
+    for name in sorted(wanted):
+        status, entry = check(name, previous.get(name), args.accept_local)
+        if entry is not None:
+            manifest[name] = dict(entry, api_name=wanted[name])
+        # Adopted files have no known source to compare against
+        if entry is None or (args.check_sources and entry['source']):
+            fetch[name] = status
+        counts[status] = counts.get(status, 0) + 1
+    print(f'{len(wanted)} dataset sprites: ' + ', '.join(f'{n} {status}' for status, n in sorted(counts.items())))
+    for name, status in sorted(fetch.items()):
+        if status != 'ok':
+            print(f'  {status}: {name}.png')
+
+    failed = []
+    if fetch and not (args.dry_run or args.no_download):
+        os.makedirs(SPRITE_DIR, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            results = pool.map(lambda name: (name, download(wanted[name], sources)), sorted(fetch))
+            for name, (url, data) in results:
+                if data is None:
+                    if name not in manifest:
+                        failed.append(name)
+                    continue
+                entry = dict(describe(data, url), api_name=wanted[name])
+                current = manifest.get(name)
+                if current and current['sha256'] == entry['sha256'] and current['source'] == url:
+                    continue
+                write_sprite(os.path.join(SPRITE_DIR, f'{name}.png'), data)
+                manifest[name] = entry
+                print(f'  downloaded {name}.png ({entry["width"]}x{entry["height"]}) from {url}')
+
+    missing = sorted(name for name in wanted if name not in manifest)
+    if not args.dry_run:
+        tmp_path = MANIFEST_FILE + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'sprites': manifest, 'missing': missing}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, MANIFEST_FILE)
+    extra = sorted(f[:-len('.png')] for f in os.listdir(SPRITE_DIR) if f.endswith('.png') and f[:-len('.png')] not in wanted)
+    if extra:
+        print(f'{len(extra)} sprites not used by any dataset entry: {", ".join(extra)}')
+    if missing:
+        print(f'{len(missing)} dataset entries have no sprite in static/pokemon/:')
+        for name in missing:
+            print(f'  {name}.png ({wanted[name]})')
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
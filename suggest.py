@@ -0,0 +1,105 @@
+"""Name suggestions for the guess box, served by /suggest.
+
+Matching mirrors what the page used to do in the browser: names whose display
+form starts with the query come first, then names that merely contain it, each
+in /pokemon_names order; when nothing matches, the closest name within two
+edits is offered as "did you mean".
+
+Both lookups are indexed once at startup. Substring search uses every suffix of
+every display name in one sorted list (a flattened suffix trie): the matches
+for a query are the contiguous run of suffixes starting with it, found with
+two bisects. Typos go through a deletion-neighbourhood index, which narrows the
+Levenshtein comparisons to the handful of names sharing a deletion variant.
+"""
+import bisect
+from functools import lru_cache
+
+MAX_TYPO_DISTANCE = 2
+DEFAULT_LIMIT = 12
+
+def levenshtein(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+def deletions(word, max_distance):
+    """word plus every string obtained by deleting up to max_distance characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found |= frontier
+    return found
+
+class TypoIndex:
+    """Deletion-neighbourhood index for 'closest word within n edits' queries.
+
+    Two strings within n edits of each other always share a string reachable
+    from both by at most n deletions, so a query only has to look up its own
+    deletions and run Levenshtein on the few names they point at.
+    """
+
+    def __init__(self, words, max_distance=MAX_TYPO_DISTANCE):
+        self.words = words
+        self.max_distance = max_distance
+        self.index = {}
+        for i, word in enumerate(words):
+            for key in deletions(word, max_distance):
+                self.index.setdefault(key, []).append(i)
+
+    def closest(self, word):
+        """(distance, index) of the nearest word within max_distance, lowest index on ties, or None."""
+        candidates = set()
+        for key in deletions(word, self.max_distance):
+            candidates.update(self.index.get(key, ()))
+        scored = [(levenshtein(word, self.words[i]), i) for i in candidates]
+        best = min(scored, default=None)
+        return best if best and best[0] <= self.max_distance else None
+
+class SuggestIndex:
+    def __init__(self, names):
+        """names: the /pokemon_names entries, dicts with 'display' and 'value'."""
+        self.names = names
+        lowered = [n['display'].lower() for n in names]
+        self.lengths = [len(text) for text in lowered]
+        suffixes = sorted((text[i:], index) for index, text in enumerate(lowered) for i in range(len(text)))
+        self.suffix_keys = [s for s, _ in suffixes]
+        self.suffix_ids = [index for _, index in suffixes]
+        self.typos = TypoIndex(lowered)
+        # Queries repeat a lot (every player types 'p', 'pi', ...), so memoize
+        self.suggest = lru_cache(maxsize=4096)(self._suggest)
+
+    def _suffix_range(self, query):
+        lo = bisect.bisect_left(self.suffix_keys, query)
+        hi = bisect.bisect_left(self.suffix_keys, query + '\U0010ffff', lo)
+        return lo, hi
+
+    def _suggest(self, query, limit=DEFAULT_LIMIT):
+        """(matches, did_you_mean) for a raw query, as name entries."""
+        query = query.strip().lower()
+        if not query:
+            return [], None
+        lo, hi = self._suffix_range(query)
+        starts = set()
+        contains = set()
+        for pos in range(lo, hi):
+            index = self.suffix_ids[pos]
+            # A suffix equal to the whole name means the name starts with the query
+            if len(self.suffix_keys[pos]) == self.lengths[index]:
+                starts.add(index)
+            else:
+                contains.add(index)
+        ranked = sorted(starts)
+        if len(ranked) < limit:
+            ranked += sorted(contains - starts)
+        matches = [self.names[i] for i in ranked[:limit]]
+        if matches:
+            return matches, None
+        closest = self.typos.closest(query)
+        return [], self.names[closest[1]] if closest else None